@@ -0,0 +1,62 @@
+"""
+Double-booking check for SQLiteAppointmentStore across worker processes.
+
+Several processes race to book the same slots (on 15-minute offsets, so half of the
+attempts overlap rather than collide exactly) in one shared database. The script
+fails if any two stored appointments overlap, or if more bookings succeeded than
+rows were stored.
+Run from the repository root:
+    python -m benchmarks.appointment_booking_processes --processes 8
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.langgraphagenticai.stores.appointment_store import SQLiteAppointmentStore
+
+
+def worker(path: str, seed: int, attempts: int, queue):
+    store = SQLiteAppointmentStore(path)
+    rng = random.Random(seed)
+    start = datetime.datetime(2025, 1, 6, 9, 0)
+    booked = 0
+    for _ in range(attempts):
+        if store.book(start + datetime.timedelta(minutes=15 * rng.randrange(200)), f'worker {seed}'):
+            booked += 1
+    queue.put(booked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=300, help="Booking attempts per process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'appointments.sqlite3')
+        SQLiteAppointmentStore(path)
+        queue = multiprocessing.Queue()
+        started = time.perf_counter()
+        processes = [multiprocessing.Process(target=worker, args=(path, seed, args.attempts, queue)) for seed in range(args.processes)]
+        for process in processes:
+            process.start()
+        succeeded = sum(queue.get() for _ in processes)
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        appointments = SQLiteAppointmentStore(path).appointments()
+        overlaps = sum(1 for a, b in zip(appointments, appointments[1:]) if b['time'] < a['time'] + datetime.timedelta(minutes=30))
+        print(f"{args.processes * args.attempts} attempts in {elapsed:.2f}s: {succeeded} succeeded, "
+              f"{len(appointments)} stored, {overlaps} overlaps")
+        if overlaps or succeeded != len(appointments):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+AppointmentCalendar at scale.
+
+Fills the calendar with random 30-minute bookings inside business hours, then times
+conflict checks, booking, cancellation and the next-free-slot search. The old linear
+scan over a list is timed on the same data for comparison.
+Run from the repository root:
+    python -m benchmarks.appointment_calendar --appointments 100000
+"""
+import argparse
+import datetime
+import random
+import time
+
+from src.langgraphagenticai.stores.appointment_calendar import AppointmentCalendar
+
+
+def per_op_us(operations: int, operation) -> float:
+    started = time.perf_counter()
+    for i in range(operations):
+        operation(i)
+    return (time.perf_counter() - started) / operations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--appointments", type=int, default=100000)
+    parser.add_argument("--fill", type=float, default=0.8, help="Fraction of business slots that are booked")
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--slots", type=int, default=5, help="Free slots requested per search")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    calendar = AppointmentCalendar()
+    start = datetime.datetime(2025, 1, 6, 9, 0)
+    slots = []
+    candidate = start
+    while len(slots) < args.appointments / args.fill:
+        candidate = calendar.next_free_slots(candidate)[0]
+        slots.append(candidate)
+        candidate += calendar.duration
+    booked = rng.sample(slots, args.appointments)
+
+    started = time.perf_counter()
+    for i, slot in enumerate(booked):
+        calendar.book(slot, f"Customer {i}")
+    print(f"booked {len(calendar)} appointments in {time.perf_counter() - started:.2f}s "
+          f"({slots[0]:%Y-%m-%d} to {slots[-1]:%Y-%m-%d})")
+
+    probes = [rng.choice(slots) for _ in range(args.operations)]
+    baseline = [{'time': slot, 'name': ''} for slot in booked]
+
+    def linear_conflict(i):
+        when = probes[i]
+        return any(a['time'] >= when and a['time'] < when + calendar.duration for a in baseline)
+
+    linear_ops = max(args.operations // 20, 1)
+    print(f"{'operation':>22} {'us/op':>10}")
+    print(f"{'conflict (bisect)':>22} {per_op_us(args.operations, lambda i: calendar.is_free(probes[i])):>10.1f}")
+    print(f"{'conflict (linear scan)':>22} {per_op_us(linear_ops, linear_conflict):>10.1f}")
+    free = [slot for slot in slots if calendar.is_free(slot)][:args.operations]
+    print(f"{'book':>22} {per_op_us(len(free), lambda i: calendar.book(free[i], 'x')):>10.1f}")
+    print(f"{'cancel':>22} {per_op_us(len(free), lambda i: calendar.cancel(free[i])):>10.1f}")
+    print(f"{f'next {args.slots} free slots':>22} {per_op_us(args.operations, lambda i: calendar.next_free_slots(probes[i], args.slots)):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Data protection check latency: the indexed customers table vs the old linear scan.
+
+Run from the repository root:
+    python -m benchmarks.customer_lookup --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.langgraphagenticai.stores.sqlite_store import FlowerShopDatabase
+
+
+def make_customers(count):
+    for i in range(count):
+        yield {
+            'name': f'Customer {i}',
+            'postcode': f'E{i % 20} {i % 9}AB',
+            'dob': f'{1950 + i % 50}-{1 + i % 12:02}-{1 + i % 28:02}',
+            'customer_id': f'CUST{i + 1}',
+            'first_line_address': f'{i} High St',
+            'phone_number': '07700900000',
+            'email': f'customer{i}@example.com',
+        }
+
+
+def linear_scan(customers, name, postcode, year, month, day):
+    # The matching loop data_protection_check used before the index
+    for customer in customers:
+        if (customer['name'].lower() == name.lower() and
+            customer['postcode'].lower() == postcode.lower() and
+            int(customer['dob'][0:4]) == year and
+            int(customer["dob"][5:7]) == month and
+            int(customer["dob"][8:10]) == day):
+            return customer
+    return None
+
+
+def time_per_call_us(check, probes):
+    started = time.perf_counter()
+    for probe in probes:
+        check(*probe)
+    return (time.perf_counter() - started) * 1e6 / len(probes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--probes", type=int, default=1000)
+    parser.add_argument("--scan-probes", type=int, default=20, help="The scan is O(N), so it gets fewer probes")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'customers':>10} {'indexed us':>11} {'scan us':>12}")
+    for size in args.sizes:
+        directory = tempfile.TemporaryDirectory()
+        database = FlowerShopDatabase(os.path.join(directory.name, 'bench.sqlite3'))
+        customers = list(make_customers(size))
+        database.customers.add_many(customers)
+        store = database.customers
+        probes = []
+        for customer in rng.sample(customers, min(args.probes, size)):
+            year, month, day = (int(part) for part in customer['dob'].split('-'))
+            probes.append((customer['name'].upper(), customer['postcode'], year, month, day))
+        indexed = time_per_call_us(store.find_by_dpa, probes)
+        scan = time_per_call_us(lambda *probe: linear_scan(customers, *probe), probes[:args.scan_probes])
+        assert all(store.find_by_dpa(*probe) is not None for probe in probes)
+        print(f"{size:>10} {indexed:>11.2f} {scan:>12.1f}")
+        database.close()
+        directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
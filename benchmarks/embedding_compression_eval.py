@@ -0,0 +1,71 @@
+"""
+Measures what Matryoshka truncation and quantised storage cost in retrieval quality.
+
+Every configuration is scored by recall@k against the full-length float32 ranking,
+over FAQ.json (questions as queries) and inventory.json (product names as queries).
+It also reports bytes per vector and the scoring latency of all queries.
+Run from the repository root:
+    python -m benchmarks.embedding_compression_eval --dimensions 1024 512 256
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.langgraphagenticai.vectorstores.numpy_index import STORAGE_DTYPES, dequantise, normalise, quantise
+from src.langgraphagenticai.vectorstores.vectore_store import FAQ_FILE_PATH, INVENTORY_FILE_PATH, MODEL_NAME, CustomEmbeddingClass
+
+
+def load_datasets():
+    with open(FAQ_FILE_PATH, 'r') as f:
+        faqs = json.load(f)
+    with open(INVENTORY_FILE_PATH, 'r') as f:
+        inventories = json.load(f)
+    return {
+        'FAQ': ([faq['question'] for faq in faqs] + [faq['answer'] for faq in faqs], [faq['question'] for faq in faqs]),
+        'Inventory': ([item['description'] for item in inventories], [item['name'] for item in inventories]),
+    }
+
+
+def top_k(queries, matrix, scales, k):
+    scores = queries @ matrix.T
+    if scales is not None:
+        scores = scores * scales
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1024, 512, 256])
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    embedding_function = CustomEmbeddingClass(args.model)
+    print(f"{'dataset':>10} {'dims':>6} {'dtype':>8} {'recall@' + str(args.k):>9} {'bytes/vec':>10} {'query ms':>9}")
+    for dataset, (documents, queries) in load_datasets().items():
+        full_documents = np.asarray(embedding_function.full_embeddings(documents), dtype=np.float32)
+        full_queries = np.asarray(embedding_function.full_embeddings(queries), dtype=np.float32)
+        k = min(args.k, len(documents))
+        reference = top_k(normalise(full_queries), normalise(full_documents), None, k)
+
+        for dimensions in [full_documents.shape[1]] + [d for d in args.dimensions if d < full_documents.shape[1]]:
+            document_matrix = normalise(full_documents[:, :dimensions])
+            query_matrix = normalise(full_queries[:, :dimensions])
+            for storage_dtype in STORAGE_DTYPES:
+                stored, scales = quantise(document_matrix, storage_dtype)
+                started = time.perf_counter()
+                for _ in range(args.repeats):
+                    ranked = top_k(query_matrix, stored, scales, k)
+                latency_ms = (time.perf_counter() - started) * 1000 / args.repeats
+                recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(reference, ranked)])
+                bytes_per_vector = stored.itemsize * dimensions + (4 if scales is not None else 0)
+                print(f"{dataset:>10} {dimensions:>6} {storage_dtype:>8} {recall:>9.3f} {bytes_per_vector:>10} {latency_ms:>9.3f}")
+                # Sanity check that quantisation round-trips to roughly the same vectors
+                assert np.allclose(dequantise(stored, scales), document_matrix, atol=0.02)
+
+
+if __name__ == "__main__":
+    main()
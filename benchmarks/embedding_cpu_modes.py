@@ -0,0 +1,77 @@
+"""
+Compares CPU inference modes of CustomEmbeddingClass.
+
+Every (model, mode) pair runs in a fresh subprocess, so load time and RSS are not
+flattered by an already-loaded model. It prints load time, RSS after load and
+embeddings/sec over the FAQ and inventory texts.
+Run from the repository root:
+    python -m benchmarks.embedding_cpu_modes --threads 4
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+# Also hides any GPU, so every mode is measured on CPU
+from benchmarks.embedding_throughput import load_corpus
+from src.langgraphagenticai.vectorstores.vectore_store import EMBEDDING_CPU_MODES, MODEL_NAME, SMALL_MODEL_NAME, CustomEmbeddingClass
+
+
+def rss_mb() -> float:
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(model_name: str, cpu_mode: str, threads: int):
+    texts = load_corpus()
+    started = time.perf_counter()
+    embedding_function = CustomEmbeddingClass(model_name, cpu_mode=cpu_mode, num_threads=threads)
+    load_seconds = time.perf_counter() - started
+    rss_after_load = rss_mb()
+
+    embedding_function(texts[:2])
+    started = time.perf_counter()
+    embedding_function(texts)
+    rate = len(texts) / (time.perf_counter() - started)
+    # cpu_mode falls back to fp32 when the model could not be quantised
+    print(json.dumps({'load_s': load_seconds, 'rss_mb': rss_after_load, 'embeddings_per_s': rate, 'cpu_mode': embedding_function.cpu_mode}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", nargs="+", default=[MODEL_NAME, SMALL_MODEL_NAME])
+    parser.add_argument("--modes", nargs="+", default=list(EMBEDDING_CPU_MODES), choices=EMBEDDING_CPU_MODES)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--single", nargs=2, metavar=("MODEL", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        measure(args.single[0], args.single[1], args.threads)
+        return
+
+    print(f"{'model':>32} {'mode':>6} {'load s':>8} {'RSS MB':>8} {'emb/s':>8}")
+    for model_name in args.models:
+        for cpu_mode in args.modes:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.embedding_cpu_modes", "--single", model_name, cpu_mode, "--threads", str(args.threads)],
+                capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                print(f"{model_name:>32} {cpu_mode:>6} failed: {completed.stderr.strip().splitlines()[-1:]}")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            ran_as = '' if result['cpu_mode'] == cpu_mode else f" (ran as {result['cpu_mode']})"
+            print(f"{model_name:>32} {cpu_mode:>6} {result['load_s']:>8.2f} {result['rss_mb']:>8.0f} {result['embeddings_per_s']:>8.1f}{ran_as}")
+
+
+if __name__ == "__main__":
+    main()
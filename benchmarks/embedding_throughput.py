@@ -0,0 +1,63 @@
+"""
+Compares per-item and batched embedding throughput on CPU.
+
+Run from the repository root:
+    python -m benchmarks.embedding_throughput --batch-sizes 8 16 32 64
+"""
+import argparse
+import json
+import os
+import time
+
+# Hide any GPU so the numbers reflect the CPU-only hosts we deploy to
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+from src.langgraphagenticai.vectorstores.vectore_store import (
+    EMBEDDING_MAX_LENGTH,
+    FAQ_FILE_PATH,
+    INVENTORY_FILE_PATH,
+    MODEL_NAME,
+    CustomEmbeddingClass,
+)
+
+
+def load_corpus():
+    with open(FAQ_FILE_PATH, 'r') as f:
+        faqs = json.load(f)
+    with open(INVENTORY_FILE_PATH, 'r') as f:
+        inventories = json.load(f)
+    return [faq['question'] for faq in faqs] + [faq['answer'] for faq in faqs] + [item['description'] for item in inventories]
+
+
+def docs_per_second(embed, texts):
+    started = time.perf_counter()
+    embed(texts)
+    return len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--max-length", type=int, default=EMBEDDING_MAX_LENGTH)
+    args = parser.parse_args()
+
+    texts = load_corpus()
+    print(f"Corpus: {len(texts)} texts from {FAQ_FILE_PATH} and {INVENTORY_FILE_PATH}")
+
+    embedding_function = CustomEmbeddingClass(args.model, max_length=args.max_length)
+    # Warm up so the first forward pass does not skew the per-item baseline
+    embedding_function.embed_one_by_one(texts[:2])
+
+    baseline = docs_per_second(embedding_function.embed_one_by_one, texts)
+    print(f"{'per-item':>12}: {baseline:8.2f} docs/sec")
+
+    for batch_size in args.batch_sizes:
+        embedding_function.batch_size = batch_size
+        embedding_function.embedding_model.embed_batch_size = batch_size
+        rate = docs_per_second(embedding_function, texts)
+        print(f"{'batch=' + str(batch_size):>12}: {rate:8.2f} docs/sec ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
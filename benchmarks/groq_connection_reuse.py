@@ -0,0 +1,49 @@
+"""
+Fresh ChatGroq per message versus the pooled client.
+
+Sends the same short prompt N times, once building a new ChatGroq for every call (as
+every Streamlit rerun used to) and once through GroqClientPool, then prints mean
+latency for each and the pool's connection reuse ratio and time-to-first-byte
+split. Needs GROQ_API_KEY in the environment.
+Run from the repository root:
+    python -m benchmarks.groq_connection_reuse --model llama3-8b-8192 --calls 10
+"""
+import argparse
+import os
+import statistics
+import time
+
+from langchain_groq import ChatGroq
+
+from src.langgraphagenticai.LLMS.client_pool import GroqClientPool
+
+
+def timed_calls(make_llm, calls: int, prompt: str) -> list:
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        make_llm().invoke(prompt)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="llama3-8b-8192")
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--prompt", default="Reply with the single word: ok")
+    args = parser.parse_args()
+    api_key = os.environ["GROQ_API_KEY"]
+
+    fresh = timed_calls(lambda: ChatGroq(api_key=api_key, model=args.model, max_tokens=5), args.calls, args.prompt)
+    pool = GroqClientPool()
+    pooled = timed_calls(lambda: pool.get(api_key, args.model).bind(max_tokens=5), args.calls, args.prompt)
+
+    print(f"fresh client per call: mean {statistics.mean(fresh):.3f}s, median {statistics.median(fresh):.3f}s")
+    print(f"pooled client:         mean {statistics.mean(pooled):.3f}s, median {statistics.median(pooled):.3f}s")
+    for name, value in pool.stats().items():
+        print(f"  {name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Concurrency stress test for FlowerShopDatabase.place_order.
+
+Many threads place random multi-item orders against a small amount of stock in a
+throwaway database. The script fails if any item ever goes negative, if the stock
+that was sold differs from the sum of the successful orders, or if the orders
+table does not hold exactly the orders that were accepted.
+Run from the repository root:
+    python -m benchmarks.inventory_concurrency --threads 16 --orders 200
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from src.langgraphagenticai.stores.sqlite_store import FlowerShopDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--stock", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=200, help="Orders per thread")
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    database = FlowerShopDatabase(os.path.join(directory.name, 'bench.sqlite3'))
+    database.inventory.bulk_load({'id': f'P{i:03}', 'name': f'Item {i}', 'quantity': args.stock} for i in range(args.items))
+    item_ids = [item['id'] for item in database.inventory.items()]
+    sold = {item_id: 0 for item_id in item_ids}
+    sold_lock = threading.Lock()
+    counts = {'placed': 0, 'rejected': 0}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(args.orders):
+            order = {item_id: rng.randint(1, 3) for item_id in rng.sample(item_ids, rng.randint(1, 4))}
+            _, problems = database.place_order(f'CUST{seed:03}', order)
+            if problems:
+                with sold_lock:
+                    counts['rejected'] += 1
+                continue
+            with sold_lock:
+                counts['placed'] += 1
+                for item_id, quantity in order.items():
+                    sold[item_id] += quantity
+            # Occasionally cancel, to exercise release alongside reserve
+            if rng.random() < 0.1:
+                database.inventory.release(order)
+                with sold_lock:
+                    for item_id, quantity in order.items():
+                        sold[item_id] -= quantity
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    failures = []
+    for item in database.inventory.items():
+        if item['quantity'] < 0:
+            failures.append(f"{item['id']} went negative: {item['quantity']}")
+        if item['quantity'] != args.stock - sold[item['id']]:
+            failures.append(f"{item['id']} has {item['quantity']} left but {sold[item['id']]} of {args.stock} were sold")
+
+    recorded = sum(database.orders.count_for_customer(f'CUST{seed:03}') for seed in range(args.threads))
+    if recorded != counts['placed']:
+        failures.append(f"{recorded} orders recorded but {counts['placed']} were accepted")
+    database.close()
+    directory.cleanup()
+
+    total = counts['placed'] + counts['rejected']
+    print(f"{total} orders in {elapsed:.2f}s ({total / elapsed:.0f}/s): {counts['placed']} placed, {counts['rejected']} rejected")
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    print("OK: stock never went negative and matches the placed orders")
+
+
+if __name__ == "__main__":
+    main()
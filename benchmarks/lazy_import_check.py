@@ -0,0 +1,47 @@
+"""
+Checks that importing the app does not read the shop's data files.
+
+Runs the import in a fresh interpreter with an audit hook on file opens, and fails
+if anything under ./data is opened (or the shop database created) before the
+first tool call. Also reports how long the import took.
+Run from the repository root:
+    python -m benchmarks.lazy_import_check
+"""
+import argparse
+import subprocess
+import sys
+
+CHILD = """
+import os, sys, time
+opened = []
+watched = (os.path.abspath('data'), os.path.abspath('.flowershop'))
+sys.addaudithook(lambda event, args: event == 'open' and isinstance(args[0], str)
+                 and os.path.abspath(args[0]).startswith(watched) and opened.append(args[0]))
+started = time.perf_counter()
+import {module}
+print(f"imported {module} in {{time.perf_counter() - started:.2f}}s")
+for path in opened:
+    print(f"opened at import time: {{path}}")
+sys.exit(1 if opened else 0)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", nargs="+", default=[
+        "src.langgraphagenticai.tools.customer_support_tools",
+        "src.langgraphagenticai.graph.graph_builder",
+        "src.langgraphagenticai.main",
+    ])
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        completed = subprocess.run([sys.executable, "-c", CHILD.format(module=module)], capture_output=True, text=True)
+        print(completed.stdout.strip() or completed.stderr.strip().splitlines()[-1])
+        failed = failed or completed.returncode != 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
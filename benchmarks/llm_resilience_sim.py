@@ -0,0 +1,85 @@
+"""
+Simulated Groq outages and slow tails, with and without the resilience layer.
+
+Each simulated model answers after a lognormal latency and fails a given share of
+calls with a 503 (the primary can also be marked as missing, which fails with a
+404). The same workload runs once as a single attempt on the primary and once
+through ResilientInvoker with fallbacks, with hedging on and off, and the script
+prints success rate, p50/p95/p99 latency and the per-model health the invoker
+recorded. Needs no API key.
+Run from the repository root:
+    python -m benchmarks.llm_resilience_sim --calls 300 --primary-error-rate 0.2
+"""
+import argparse
+import random
+import statistics
+import time
+
+from src.langgraphagenticai.LLMS import resilience
+from src.langgraphagenticai.LLMS.resilience import ResilientInvoker
+
+
+class SimulatedError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"simulated HTTP {status_code}")
+        self.status_code = status_code
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))] if ordered else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--primary-error-rate", type=float, default=0.2)
+    parser.add_argument("--fallback-error-rate", type=float, default=0.02)
+    parser.add_argument("--median-seconds", type=float, default=0.05, help="median simulated call latency")
+    parser.add_argument("--tail-sigma", type=float, default=0.8, help="lognormal sigma; larger means a slower tail")
+    parser.add_argument("--primary-missing", action="store_true", help="primary model fails with 404 on every call")
+    args = parser.parse_args()
+
+    # Scaled to the simulated latencies so the run takes seconds, not minutes
+    resilience.BASE_BACKOFF_SECONDS = args.median_seconds / 2
+    rng = random.Random(0)
+    error_rates = {'primary': args.primary_error_rate, 'fallback-1': args.fallback_error_rate, 'fallback-2': args.fallback_error_rate}
+
+    def call(model: str, attempt=None):
+        if attempt is not None:
+            attempt.admitted()
+        if model == 'primary' and args.primary_missing:
+            raise SimulatedError(404)
+        time.sleep(args.median_seconds * rng.lognormvariate(0, args.tail_sigma))
+        if rng.random() < error_rates[model]:
+            raise SimulatedError(503)
+        return model
+
+    def run(name, invoke):
+        latencies, failures = [], 0
+        for _ in range(args.calls):
+            started = time.perf_counter()
+            try:
+                invoke()
+            except SimulatedError:
+                failures += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+        print(f"{name:>24}: {1 - failures / args.calls:>7.1%} ok, p50 {percentile(latencies, 0.5):.3f}s, "
+              f"p95 {percentile(latencies, 0.95):.3f}s, p99 {percentile(latencies, 0.99):.3f}s, "
+              f"mean {statistics.mean(latencies) if latencies else float('nan'):.3f}s")
+
+    run("single attempt", lambda: call('primary'))
+    chain = ['primary', 'fallback-1', 'fallback-2']
+    for hedge in (False, True):
+        invoker = ResilientInvoker(hedge=hedge)
+        run(f"resilient, hedge={hedge}", lambda: invoker.invoke(chain, call))
+        stats = invoker.stats()
+        print(f"{'':>24}  {stats['fallbacks']} fallbacks, {stats['exhausted']} exhausted")
+        for model, health in stats['models'].items():
+            print(f"{'':>24}  {model}: {health['error_rate']:.0%} errors of {health['calls']}, "
+                  f"{health['retries']} retries, {health['hedge_wins']}/{health['hedges']} hedges won")
+
+
+if __name__ == "__main__":
+    main()
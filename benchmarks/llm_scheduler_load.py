@@ -0,0 +1,72 @@
+"""
+Load test for the LLM scheduler, with simulated Groq calls.
+
+Threads issue interactive and background "calls" (a sleep of --call-seconds with
+an estimated token cost) through one LLMScheduler configured with deliberately
+tight RPM/TPM limits, then prints achieved request and token rates against the
+limits, peak queue depth, rejections and the wait time of each priority class.
+Needs no API key.
+Run from the repository root:
+    python -m benchmarks.llm_scheduler_load --rpm 60 --tpm 20000 --interactive 20 --background 40
+"""
+import argparse
+import random
+import threading
+import time
+
+from src.langgraphagenticai.LLMS.rate_limiter import BACKGROUND, INTERACTIVE, LLMQueueFullError, LLMScheduler
+
+MODEL = 'simulated-model'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rpm", type=float, default=60)
+    parser.add_argument("--tpm", type=float, default=20000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-queued", type=int, default=64)
+    parser.add_argument("--interactive", type=int, default=20, help="interactive calls")
+    parser.add_argument("--background", type=int, default=40, help="background calls")
+    parser.add_argument("--tokens", type=int, default=800, help="mean estimated tokens per call")
+    parser.add_argument("--call-seconds", type=float, default=0.3)
+    args = parser.parse_args()
+
+    scheduler = LLMScheduler(args.concurrency, args.max_queued)
+    scheduler.configure({MODEL: (args.rpm, args.tpm)}, args.concurrency, args.max_queued)
+    rejected = []
+    rng = random.Random(0)
+    calls = [INTERACTIVE] * args.interactive + [BACKGROUND] * args.background
+    rng.shuffle(calls)
+
+    def call(priority: int, tokens: int):
+        try:
+            with scheduler.slot('benchmark', MODEL, tokens, priority) as slot:
+                time.sleep(args.call_seconds)
+                # Real usage lands within +-20% of the estimate
+                slot.used_tokens = int(tokens * rng.uniform(0.8, 1.2))
+        except LLMQueueFullError:
+            rejected.append(priority)
+
+    started = time.perf_counter()
+    threads = []
+    for priority in calls:
+        thread = threading.Thread(target=call, args=(priority, int(args.tokens * rng.uniform(0.5, 1.5))))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = scheduler.stats()
+    minutes = elapsed / 60
+    print(f"{len(calls)} calls in {elapsed:.1f}s")
+    # Buckets start full, so a whole minute's allowance can go out at once; the rest is paced
+    print(f"requests: {stats['admitted']}, {max(0, stats['admitted'] - args.rpm) / minutes:.0f}/min beyond the initial burst (limit {args.rpm:.0f})")
+    print(f"tokens:   {stats['used_tokens']}, {max(0, stats['used_tokens'] - args.tpm) / minutes:.0f}/min beyond the initial burst (limit {args.tpm:.0f})")
+    for name, value in stats.items():
+        print(f"  {name}: {value:.3f}" if isinstance(value, float) else f"  {name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
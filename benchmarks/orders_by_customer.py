@@ -0,0 +1,64 @@
+"""
+Order-history lookup latency as the orders table grows.
+
+A set of probe customers keeps a fixed number of orders while filler orders for
+other customers are added in steps. With the customer_id index the lookup time
+should stay flat however many orders the table holds.
+Run from the repository root:
+    python -m benchmarks.orders_by_customer --steps 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from src.langgraphagenticai.stores.sqlite_store import FlowerShopDatabase
+
+STATUSES = ['Processing', 'Shipped', 'Waiting for payment']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", nargs="+", type=int, default=[10000, 100000, 1000000], help="Total filler orders at each step")
+    parser.add_argument("--probe-customers", type=int, default=100)
+    parser.add_argument("--orders-per-customer", type=int, default=50)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        database = FlowerShopDatabase(os.path.join(directory, 'bench.sqlite3'))
+        database.orders.add_many({
+            'order_id': f'PROBE{c:05}-{i:04}', 'customer_id': f'PROBE{c:05}',
+            'status': rng.choice(STATUSES), 'items': ['P0001'], 'quantity': [1],
+        } for c in range(args.probe_customers) for i in range(args.orders_per_customer))
+
+        filler = 0
+        print(f"{'orders':>10} {'page p50 us':>12} {'page p99 us':>12} {'status p50 us':>14}")
+        for step in sorted(args.steps):
+            database.orders.add_many({
+                'order_id': f'FILL{i:09}', 'customer_id': f'CUST{rng.randrange(step):09}',
+                'status': rng.choice(STATUSES), 'items': ['P0001'], 'quantity': [1],
+            } for i in range(filler, step))
+            filler = step
+
+            page_times, status_times = [], []
+            for _ in range(args.lookups):
+                customer_id = f'PROBE{rng.randrange(args.probe_customers):05}'
+                started = time.perf_counter()
+                database.orders.for_customer(customer_id, limit=20, offset=20)
+                page_times.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                database.orders.for_customer(customer_id, status=rng.choice(STATUSES), limit=20)
+                status_times.append(time.perf_counter() - started)
+            page_times.sort()
+            total = step + args.probe_customers * args.orders_per_customer
+            print(f"{total:>10} {statistics.median(page_times) * 1e6:>12.0f} {page_times[int(len(page_times) * 0.99)] * 1e6:>12.0f} "
+                  f"{statistics.median(status_times) * 1e6:>14.0f}")
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
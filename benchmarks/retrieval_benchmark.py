@@ -0,0 +1,148 @@
+"""
+Retrieval benchmark and regression check for the flower shop vector store.
+
+Builds a fresh FlowerShopVectorStore in a temporary directory, runs the labelled
+queries in benchmarks/retrieval_queries.json and reports cold start time, ingestion
+throughput, p50/p95/p99 query latency, recall@k, MRR and peak RSS.
+
+By default it uses the offline hashing embedder, so it runs on any CI box:
+    python -m benchmarks.retrieval_benchmark --backend numpy
+    python -m benchmarks.retrieval_benchmark --save-baseline benchmarks/retrieval_baseline.json
+    python -m benchmarks.retrieval_benchmark --baseline benchmarks/retrieval_baseline.json
+Pass --embedder model to measure the real HuggingFace model instead.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.langgraphagenticai.vectorstores.hybrid_retriever import HybridFAQRetriever
+from src.langgraphagenticai.vectorstores.local_embedder import HashingEmbeddingFunction
+from src.langgraphagenticai.vectorstores.vectore_store import FAQ_FILE_PATH, MODEL_NAME, CustomEmbeddingClass, FlowerShopVectorStore
+
+QUERIES_PATH = os.path.join(os.path.dirname(__file__), 'retrieval_queries.json')
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def ranked_labels(result, label_key):
+    labels = []
+    for position, record_id in enumerate(result['ids'][0]):
+        label = result['metadatas'][0][position]['question'] if label_key == 'question' else record_id
+        # Each FAQ is indexed by both its question and its answer; count it once
+        if label not in labels:
+            labels.append(label)
+    return labels
+
+
+def evaluate(name, search, queries, label_key, k, repeats):
+    latencies, recalls, reciprocal_ranks = [], [], []
+    for labelled in queries:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = search(labelled['query'])
+            latencies.append((time.perf_counter() - started) * 1000)
+        labels = ranked_labels(result, label_key)[:k]
+        expected = labelled['expected']
+        recalls.append(len(set(labels) & set(expected)) / min(len(expected), k))
+        rank = next((i + 1 for i, label in enumerate(labels) if label in expected), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+    return {
+        'queries': len(queries),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        f'recall@{k}': float(np.mean(recalls)),
+        'mrr': float(np.mean(reciprocal_ranks)),
+    }
+
+
+def regressions(report, baseline, recall_tolerance, latency_factor):
+    problems = []
+    for name, metrics in baseline['datasets'].items():
+        current = report['datasets'].get(name)
+        if current is None:
+            problems.append(f"{name}: missing from this run")
+            continue
+        for metric, value in metrics.items():
+            if metric.startswith('recall@') or metric == 'mrr':
+                if current[metric] < value - recall_tolerance:
+                    problems.append(f"{name}: {metric} fell from {value:.3f} to {current[metric]:.3f}")
+            elif metric == 'p95_ms' and current[metric] > value * latency_factor:
+                problems.append(f"{name}: p95 rose from {value:.2f}ms to {current[metric]:.2f}ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=['chroma', 'numpy'], default='chroma')
+    parser.add_argument("--embedder", choices=['local', 'model'], default='local')
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", help="Fail if results regress against this report")
+    parser.add_argument("--save-baseline", help="Write this run's report to the given path")
+    parser.add_argument("--recall-tolerance", type=float, default=0.02)
+    parser.add_argument("--latency-factor", type=float, default=1.5)
+    args = parser.parse_args()
+
+    with open(QUERIES_PATH, 'r') as f:
+        labelled = json.load(f)
+
+    workdir = tempfile.mkdtemp(prefix="retrieval_bench_")
+    try:
+        started = time.perf_counter()
+        embedding_function = HashingEmbeddingFunction() if args.embedder == 'local' else CustomEmbeddingClass(MODEL_NAME)
+        embedder_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store = FlowerShopVectorStore(embedding_function=embedding_function, backend=args.backend, db_path=workdir)
+        ingest_seconds = time.perf_counter() - started
+        ingested = sum(summary['added'] for summary in store.ingestion_summary.values())
+
+        hybrid = HybridFAQRetriever.from_file(FAQ_FILE_PATH, store.query_faqs)
+        datasets = {
+            'faq': evaluate('faq', store.query_faqs, labelled['faq'], 'question', args.k, args.repeats),
+            'faq_hybrid': evaluate('faq_hybrid', hybrid.query, labelled['faq'], 'question', args.k, args.repeats),
+            'inventory': evaluate('inventory', store.query_inventories, labelled['inventory'], 'id', args.k, args.repeats),
+        }
+        report = {
+            'backend': args.backend,
+            'embedder': embedding_function.model_name,
+            'embedder_load_s': embedder_seconds,
+            'cold_start_s': embedder_seconds + ingest_seconds,
+            'ingested_records': ingested,
+            'ingestion_records_per_s': ingested / ingest_seconds if ingest_seconds else 0.0,
+            'hybrid_paths': hybrid.stats(),
+            'peak_rss_mb': peak_rss_mb(),
+            'datasets': datasets,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'backend': report['backend'], 'embedder': report['embedder'], 'datasets': datasets}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            problems = regressions(report, json.load(f), args.recall_tolerance, args.latency_factor)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Offline evaluation of the semantic response cache: false-hit rate versus latency saved.
+
+Fills a SemanticCache with the FAQ.json questions (each answer stands in for the
+LLM's reply), then asks five kinds of query at every similarity threshold:
+close paraphrases and the retrieval benchmark's looser paraphrases (where a hit
+should return the matching FAQ answer), and distinct questions, one-word swaps
+and negations of FAQ questions from semantic_cache_queries.json (where any hit
+is a wrong answer served to the user). Each threshold is run with and without
+the content-word check (--embedding-only runs without it only).
+Latency saved assumes every correct or false hit skips one LLM call of
+--llm-latency seconds; every lookup pays the embedding and search cost.
+Run from the repository root:
+    python -m benchmarks.semantic_cache_eval --thresholds 0.8 0.85 0.9 0.95
+"""
+import argparse
+import json
+import os
+
+from src.langgraphagenticai.LLMS.semantic_cache import SemanticCache
+from src.langgraphagenticai.vectorstores.vectore_store import FAQ_FILE_PATH
+
+QUERIES_PATH = os.path.join(os.path.dirname(__file__), 'semantic_cache_queries.json')
+RETRIEVAL_QUERIES_PATH = os.path.join(os.path.dirname(__file__), 'retrieval_queries.json')
+USE_CASE = 'Customer Support'
+MODEL_NAME = 'eval'
+
+
+def load_queries():
+    with open(QUERIES_PATH, 'r') as f:
+        queries = json.load(f)
+    with open(RETRIEVAL_QUERIES_PATH, 'r') as f:
+        loose = [{'query': query['query'], 'expected': query['expected'][0]} for query in json.load(f)['faq']]
+    return {
+        'close paraphrases': queries['paraphrases'],
+        'loose paraphrases': loose,
+        'distinct': [{'query': query, 'expected': None} for query in queries['distinct']],
+        'one-word swaps': [{'query': query, 'expected': None} for query in queries['swaps']],
+        'negations': [{'query': query, 'expected': None} for query in queries['negations']],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.75, 0.8, 0.85, 0.9, 0.95])
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="seconds per LLM call a hit avoids")
+    parser.add_argument("--embedding-only", action="store_true", help="skip the runs with the content-word check")
+    args = parser.parse_args()
+
+    with open(FAQ_FILE_PATH, 'r') as f:
+        faqs = json.load(f)
+    answers = {faq['answer']: faq['question'] for faq in faqs}
+    query_sets = load_queries()
+
+    caches = {}
+    for match_content_words in ((False,) if args.embedding_only else (False, True)):
+        cache = SemanticCache(match_content_words=match_content_words)
+        for faq in faqs:
+            cache.store(USE_CASE, MODEL_NAME, faq['question'], faq['answer'])
+        caches['words' if match_content_words else 'vector'] = cache
+
+    print(f"{'threshold':>9} {'match':>6} {'queries':>18} {'hit rate':>9} {'false hits':>11} {'saved s':>8} {'lookup ms':>10}")
+    for threshold, (match, cache) in ((threshold, entry) for threshold in args.thresholds for entry in caches.items()):
+        for name, queries in query_sets.items():
+            hits = false_hits = 0
+            before = cache.stats()[USE_CASE]
+            for query in queries:
+                answer = cache.lookup(USE_CASE, MODEL_NAME, query['query'], threshold)
+                if answer is None:
+                    continue
+                if answers[answer] == query['expected']:
+                    hits += 1
+                else:
+                    false_hits += 1
+            after = cache.stats()[USE_CASE]
+            lookups = after['lookups'] - before['lookups']
+            lookup_seconds = after['mean_lookup_seconds'] * after['lookups'] - before['mean_lookup_seconds'] * before['lookups']
+            saved = (hits + false_hits) * args.llm_latency - lookup_seconds
+            print(f"{threshold:>9.2f} {match:>6} {name:>18} {hits / lookups:>9.1%} {false_hits / lookups:>11.1%} "
+                  f"{saved:>8.1f} {lookup_seconds * 1000 / lookups:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
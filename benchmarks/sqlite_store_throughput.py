@@ -0,0 +1,81 @@
+"""
+Throughput of the SQLite-backed FlowerShopDatabase.
+
+Creates a throwaway database, bulk-loads synthetic customers, inventory and orders,
+then measures DPA checks, order placement and order retrieval per second from a
+number of threads sharing the connection pool.
+Run from the repository root:
+    python -m benchmarks.sqlite_store_throughput --customers 100000 --threads 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from src.langgraphagenticai.stores.sqlite_store import FlowerShopDatabase
+
+
+def run(name: str, threads: int, operations: int, operation):
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(operations):
+            operation(rng)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>18} {threads * operations:>9} ops {elapsed:>8.2f}s {threads * operations / elapsed:>10.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=200000, help="Orders preloaded before timing")
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=2000, help="Operations per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = FlowerShopDatabase(os.path.join(directory, 'bench.sqlite3'))
+        customers = [{
+            'name': f'Customer {i}', 'postcode': f'AB{i % 100} {i % 10}CD', 'dob': f'{1950 + i % 50}-{1 + i % 12:02}-{1 + i % 28:02}',
+            'customer_id': f'CUST{i:07}', 'first_line_address': f'{i} High St', 'phone_number': '07700000000', 'email': f'c{i}@example.com',
+        } for i in range(args.customers)]
+        started = time.perf_counter()
+        database.customers.add_many(customers)
+        database.inventory.bulk_load({'id': f'P{i:04}', 'name': f'Item {i}', 'quantity': 10 ** 9} for i in range(args.items))
+        rng = random.Random(0)
+        database.orders.add_many({
+            'order_id': f'SEED{i:08}', 'customer_id': customers[rng.randrange(args.customers)]['customer_id'],
+            'status': 'Shipped', 'items': ['P0000'], 'quantity': [1],
+        } for i in range(args.orders))
+        print(f"bulk load: {args.customers} customers, {args.items} items, {args.orders} orders in {time.perf_counter() - started:.2f}s")
+
+        def dpa_check(rng):
+            customer = customers[rng.randrange(args.customers)]
+            year, month, day = customer['dob'].split('-')
+            assert database.customers.find_by_dpa(customer['name'], customer['postcode'], int(year), int(month), int(day)) is not None
+
+        def place_order(rng):
+            items = {f'P{i:04}': rng.randint(1, 3) for i in rng.sample(range(args.items), rng.randint(1, 4))}
+            order, problems = database.place_order(customers[rng.randrange(args.customers)]['customer_id'], items)
+            assert not problems
+
+        def retrieve_orders(rng):
+            database.orders.for_customer(customers[rng.randrange(args.customers)]['customer_id'])
+
+        run("DPA check", args.threads, args.operations, dpa_check)
+        run("place order", args.threads, args.operations, place_order)
+        run("retrieve orders", args.threads, args.operations, retrieve_orders)
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
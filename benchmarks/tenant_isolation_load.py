@@ -0,0 +1,114 @@
+"""
+Load test for the tools' shared state under many concurrent sessions.
+
+Many concurrent sessions, each with its own thread_id, drive the customer support and
+appointment tools through their normal tool interface. Customers, orders, the
+appointment diary, the DPA audit log and stock are shop-wide, so every session
+registers its own customer and checks that another session can find it, all
+sessions race for the same appointment slots and every session orders from the one
+stock level. The script fails if a customer or order goes missing, a slot is booked
+twice or not at all, a DPA check is lost, or more units were sold than were in
+stock, and reports the throughput.
+Run from the repository root (state is written under a temporary directory):
+    python -m benchmarks.tenant_isolation_load --sessions 200 --threads 32
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_session(session: int, args) -> tuple:
+    from src.langgraphagenticai.tools import customer_support_tools as cs
+    from src.langgraphagenticai.tools import customtool
+
+    config = {"configurable": {"thread_id": f"load-test-session-{session}"}}
+    other_config = {"configurable": {"thread_id": f"load-test-session-{session}-elsewhere"}}
+    problems = []
+    created = cs.create_new_customer.invoke({
+        'first_name': 'Sam', 'surname': f'Session{session}', 'year_of_birth': 1990, 'month_of_birth': 1, 'day_of_birth': 1,
+        'postcode': 'AB1 2CD', 'first_line_of_address': '1 High St', 'phone_number': '07700900000', 'email': 'sam@example.com',
+    }, config=config)
+    customer_id = created.rsplit(' ', 1)[-1]
+
+    # The customer must be found from any session, e.g. after a page reload
+    check = cs.data_protection_check.invoke({
+        'name': f'Sam Session{session}', 'postcode': 'AB1 2CD', 'year_of_birth': 1990, 'month_of_birth': 1, 'day_of_birth': 1,
+    }, config=other_config)
+    if 'passed' not in check or customer_id not in check:
+        problems.append(f"customer {customer_id} registered by session {session} is not found from another session")
+
+    placed = 0
+    for _ in range(args.orders):
+        result = cs.place_order.invoke({'items': {'P001': 1}, 'customer_id': customer_id}, config=config)
+        placed += 'placed successfully' in result
+    orders = cs.retrieve_existing_customer_orders.invoke({'customer_id': customer_id}, config=other_config)
+    total_orders = orders['total_orders'] if isinstance(orders, dict) else 0
+    if total_orders != placed:
+        problems.append(f"customer {customer_id} has {total_orders} orders, expected {placed}")
+
+    # Every session wants the same slots: each must go to exactly one of them
+    booked = []
+    for hour in range(9, 9 + args.appointments):
+        result = customtool.book_appointment.invoke({
+            'appointment_year': 2030, 'appointment_month': 1, 'appointment_day': 7, 'appointment_hour': hour,
+            'appointment_minute': 0, 'appointment_name': f'Session{session}',
+        }, config=config)
+        if 'booked for' in result:
+            booked.append(hour)
+        elif 'already booked' not in result:
+            problems.append(f"session {session} could not book {hour}:00: {result}")
+    return problems, placed, booked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=5, help="Orders per session")
+    parser.add_argument("--appointments", type=int, default=4, help="Appointments per session")
+    args = parser.parse_args()
+
+    repository = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # Tenant state lives under ./.flowershop relative to the working directory
+        os.symlink(os.path.join(repository, 'data'), os.path.join(directory, 'data'))
+        os.chdir(directory)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as executor:
+            results = list(executor.map(lambda session: run_session(session, args), range(args.sessions)))
+        elapsed = time.perf_counter() - started
+
+        from src.langgraphagenticai.stores.tenant_state import tenant_registry
+        from src.langgraphagenticai.tools.customer_support_tools import INVENTORY_FILE_PATH
+        with open(INVENTORY_FILE_PATH, 'r') as f:
+            stock = next(item['quantity'] for item in json.load(f) if item['id'] == 'P001')
+        remaining = tenant_registry.default.database().inventory.get('P001')['quantity']
+        diary = Counter(appointment['time'].hour for appointment in tenant_registry.default.appointments().appointments())
+        dpa_checks = len(tenant_registry.default.data_protection_checks)
+        os.chdir(repository)
+
+    problems = [problem for result, _, _ in results for problem in result]
+    sold = sum(placed for _, placed, _ in results)
+    if sold + remaining != stock:
+        problems.append(f"{sold} units of P001 sold and {remaining} left, but {stock} were in stock")
+    winners = Counter(hour for _, _, booked in results for hour in booked)
+    for hour in range(9, 9 + args.appointments):
+        if winners[hour] != 1 or diary[hour] != 1:
+            problems.append(f"{hour}:00 was booked by {winners[hour]} sessions and is in the diary {diary[hour]} times, expected once")
+    if dpa_checks != args.sessions:
+        problems.append(f"the audit log holds {dpa_checks} DPA checks, expected {args.sessions}")
+    calls = args.sessions * (3 + args.orders + args.appointments)
+    print(f"{args.sessions} sessions, {calls} tool calls in {elapsed:.2f}s ({calls / elapsed:.0f} calls/s), "
+          f"{len(problems)} failures")
+    for problem in problems[:20]:
+        print(f"  {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compares top-k query latency of the Chroma and NumPy vector store backends.
+
+Random unit vectors stand in for real embeddings, so no model is loaded.
+Run from the repository root:
+    python -m benchmarks.vector_backend_latency --sizes 1000 100000 1000000 --dimension 1024
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from chromadb import PersistentClient
+
+from src.langgraphagenticai.vectorstores.numpy_index import NumpyCollection, normalise
+
+
+def random_vectors(count, dimension, seed):
+    return normalise(np.random.default_rng(seed).standard_normal((count, dimension), dtype=np.float32))
+
+
+def fill(collection, vectors, batch_size):
+    for start in range(0, len(vectors), batch_size):
+        batch = vectors[start:start + batch_size]
+        ids = [str(i) for i in range(start, start + len(batch))]
+        collection.upsert(ids=ids, documents=ids, metadatas=[{'row': i} for i in range(start, start + len(batch))], embeddings=batch)
+
+
+def time_queries(collection, queries, n_results, batch):
+    latencies = []
+    for start in range(0, len(queries), batch):
+        started = time.perf_counter()
+        collection.query(query_embeddings=queries[start:start + batch], n_results=n_results)
+        latencies.append((time.perf_counter() - started) * 1000 / len(queries[start:start + batch]))
+    return np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-results", type=int, default=5)
+    parser.add_argument("--query-batch", type=int, default=1, help="Queries per call; >1 exercises multi-query batches")
+    parser.add_argument("--skip-chroma", action="store_true")
+    parser.add_argument("--numpy-batch", type=int, default=1000, help="Rows per NumpyCollection upsert; the build includes one persist")
+    args = parser.parse_args()
+
+    queries = random_vectors(args.queries, args.dimension, seed=1)
+    print(f"{'backend':>8} {'vectors':>9} {'build s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for size in args.sizes:
+        vectors = random_vectors(size, args.dimension, seed=0)
+        workdir = tempfile.mkdtemp(prefix="vector_bench_")
+        try:
+            backends = {'numpy': NumpyCollection('bench', workdir)}
+            if not args.skip_chroma:
+                client = PersistentClient(path=workdir + '/chroma')
+                backends['chroma'] = client.get_or_create_collection(name='bench', metadata={'hnsw:space': 'cosine'})
+            for name, collection in backends.items():
+                batch_size = args.numpy_batch if name == 'numpy' else client.get_max_batch_size()
+                started = time.perf_counter()
+                fill(collection, vectors, batch_size)
+                if name == 'numpy':
+                    collection.persist()
+                build_seconds = time.perf_counter() - started
+                p50, p95 = time_queries(collection, queries, args.n_results, args.query_batch)
+                print(f"{name:>8} {size:>9} {build_seconds:>9.2f} {p50:>9.3f} {p95:>9.3f}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_groq import ChatGroq
+
+from src.langgraphagenticai.LLMS.rate_limiter import INTERACTIVE, estimate_tokens, llm_scheduler, message_texts
+from src.langgraphagenticai.LLMS.resilience import Attempt, resilient_invoker
+from src.langgraphagenticai.LLMS.response_cache import FALLBACK_MODEL_INFO
+
+CLIENT_IDLE_SECONDS = 900
+MAX_POOLED_CLIENTS = 32
+KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY_SECONDS = 120
+HTTP_TIMEOUT = httpx.Timeout(timeout=60.0, connect=5.0)
+
+
+def api_key_hash(api_key: str) -> str:
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+
+
+class ConnectionStats:
+    """
+    Counts requests and new TCP connections on the shared HTTP client, and splits
+    time-to-first-byte by whether the request had to open a connection.
+
+    Timing uses httpx event hooks plus the httpcore trace extension, which reports
+    connection setup as separate events.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.ttfb_new = 0.0
+        self.ttfb_reused = 0.0
+
+    def on_request(self, request: httpx.Request):
+        trace = {'started': time.perf_counter(), 'connected': False}
+
+        def tracer(event_name: str, info: Dict):
+            if event_name == 'connection.connect_tcp.complete':
+                trace['connected'] = True
+
+        request.extensions['trace'] = tracer
+        request.extensions['pool_trace'] = trace
+
+    def on_response(self, response: httpx.Response):
+        trace = response.request.extensions.get('pool_trace')
+        if trace is None:
+            return
+        ttfb = time.perf_counter() - trace['started']
+        with self._lock:
+            self.requests += 1
+            if trace['connected']:
+                self.new_connections += 1
+                self.ttfb_new += ttfb
+            else:
+                self.ttfb_reused += ttfb
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            requests, new, ttfb_new, ttfb_reused = self.requests, self.new_connections, self.ttfb_new, self.ttfb_reused
+        reused = requests - new
+        mean_new = ttfb_new / new if new else None
+        mean_reused = ttfb_reused / reused if reused else None
+        return {
+            'requests': requests,
+            'new_connections': new,
+            'connection_reuse_ratio': reused / requests if requests else 0.0,
+            'mean_ttfb_new_connection_s': mean_new,
+            'mean_ttfb_reused_connection_s': mean_reused,
+            'ttfb_saved_per_reuse_s': mean_new - mean_reused if mean_new is not None and mean_reused is not None else None,
+        }
+
+
+class ScheduledChatGroq(ChatGroq):
+    """
+    ChatGroq whose requests wait for the shared LLMScheduler, so RPM/TPM limits and
+    concurrency are enforced for every node using the model, and go through the
+    ResilientInvoker, which retries, hedges and falls back to fallback_models.
+    Cached responses never reach _generate and so cost nothing; answers from a
+    fallback model are tagged so the response cache does not store them as the
+    selected model's.
+    """
+    scheduler_priority: int = INTERACTIVE
+    fallback_models: List[str] = []
+
+    def _scheduler_slot(self, messages: List[BaseMessage], kwargs: Dict[str, Any]):
+        api_key = self.groq_api_key.get_secret_value() if self.groq_api_key else ''
+        tokens = estimate_tokens(message_texts(messages, kwargs.get('tools')), kwargs.get('max_tokens') or self.max_tokens)
+        return llm_scheduler.slot(api_key_hash(api_key), self.model_name, tokens, self.scheduler_priority)
+
+    def _scheduled_generate(self, messages: List[BaseMessage], stop: Optional[List[str]], run_manager,
+                            attempt: Optional[Attempt] = None, **kwargs: Any) -> ChatResult:
+        with self._scheduler_slot(messages, kwargs) as slot:
+            if attempt is not None:
+                attempt.admitted()
+            result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            slot.used_tokens = ((result.llm_output or {}).get('token_usage') or {}).get('total_tokens')
+        return result
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.streaming:
+            # ChatGroq streams through _stream, which takes the slot itself
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        def send(model: str, attempt: Attempt) -> ChatResult:
+            # Same underlying client and connections; only the model in the request changes
+            llm = self if model == self.model_name else self.model_copy(update={'model_name': model})
+            result = llm._scheduled_generate(messages, stop, run_manager, attempt, **kwargs)
+            if model != self.model_name:
+                for generation in result.generations:
+                    generation.generation_info = {**(generation.generation_info or {}), FALLBACK_MODEL_INFO: model}
+            return result
+
+        return resilient_invoker.invoke([self.model_name, *self.fallback_models], send)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        with self._scheduler_slot(messages, kwargs):
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+class GroqClientPool:
+    """
+    ChatGroq instances cached by (API key hash, model) so Streamlit reruns stop
+    rebuilding clients. Every pooled client sends through one shared keep-alive
+    httpx.Client, so connections to the Groq API survive across reruns and models.
+    Clients idle for longer than idle_seconds are dropped on the next lookup.
+    The raw API key is never used as a dictionary key.
+    """
+    def __init__(self, idle_seconds: float = CLIENT_IDLE_SECONDS, max_clients: int = MAX_POOLED_CLIENTS):
+        self.idle_seconds = idle_seconds
+        self.max_clients = max_clients
+        self.connection_stats = ConnectionStats()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[Tuple[str, str], Tuple[ScheduledChatGroq, float]]" = OrderedDict()
+        self._http_client = None
+
+    def _shared_http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(max_keepalive_connections=KEEPALIVE_CONNECTIONS, keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS),
+                event_hooks={'request': [self.connection_stats.on_request], 'response': [self.connection_stats.on_response]},
+            )
+        return self._http_client
+
+    def _evict_idle(self, now: float):
+        while self._clients:
+            key, (_, last_used) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_seconds and len(self._clients) <= self.max_clients:
+                break
+            del self._clients[key]
+            self.counters['evictions'] += 1
+
+    def get(self, api_key: str, model: str) -> ScheduledChatGroq:
+        key = (api_key_hash(api_key), model)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                self.counters['hits'] += 1
+                self._clients[key] = (entry[0], now)
+                self._clients.move_to_end(key)
+                return entry[0]
+            self.counters['misses'] += 1
+            # Retries are left to the ResilientInvoker rather than the Groq SDK
+            llm = ScheduledChatGroq(api_key=api_key, model=model, max_retries=0, http_client=self._shared_http_client())
+            self._clients[key] = (llm, now)
+            self._evict_idle(now)
+            return llm
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            pooled = len(self._clients)
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'pooled_clients': pooled,
+            **counters,
+            'client_hit_rate': counters['hits'] / lookups if lookups else 0.0,
+            **self.connection_stats.snapshot(),
+        }
+
+
+groq_client_pool = GroqClientPool()
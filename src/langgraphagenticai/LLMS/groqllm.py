@@ -1,7 +1,12 @@
 import os
 
 import streamlit as st
-from langchain_groq import ChatGroq
+
+from src.langgraphagenticai.LLMS.client_pool import groq_client_pool
+from src.langgraphagenticai.LLMS.rate_limiter import BACKGROUND, llm_scheduler
+from src.langgraphagenticai.LLMS.resilience import resilient_invoker
+from src.langgraphagenticai.LLMS.response_cache import response_cache_for
+from src.langgraphagenticai.ui.uiconfigfile import Config
 
 
 class GroqLLM:
@@ -14,7 +19,22 @@ class GroqLLM:
             selected_groq_model = self.user_controls_input['selected_groq_model']
             if groq_api_key=='' and os.environ["GROQ_API_KEY"] =='':
                 st.error("Please Enter the Groq API KEY")
-            llm = ChatGroq(api_key =groq_api_key, model=selected_groq_model)
+            config = Config()
+            llm_scheduler.configure(config.get_groq_rate_limits(), config.get_groq_max_concurrent_requests(),
+                                    config.get_groq_max_queued_requests())
+            resilient_invoker.configure(config.get_llm_max_attempts_per_model(), config.get_llm_hedge_requests())
+            llm = groq_client_pool.get(groq_api_key, selected_groq_model)
+            usecase = self.user_controls_input.get('selected_usecase')
+            # Tried in turn when the selected model keeps failing
+            overrides = {'fallback_models': [model for model in config.get_groq_fallback_models() if model != selected_groq_model]}
+            cache = response_cache_for(usecase, config.get_llm_cache_ttls())
+            if cache is not None:
+                overrides['cache'] = cache
+            if usecase in config.get_llm_background_use_cases():
+                # Queued behind interactive chat when the rate limits are tight
+                overrides['scheduler_priority'] = BACKGROUND
+            # Shallow copy: the pooled client and its HTTP connections are shared
+            llm = llm.model_copy(update=overrides)
             
         except Exception as e:
             raise ValueError(f"Error Occurred with Exception : {e}")
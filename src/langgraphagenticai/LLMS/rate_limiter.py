@@ -0,0 +1,250 @@
+import bisect
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Priority classes, lowest value admitted first
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_CLASSES = {'interactive': INTERACTIVE, 'background': BACKGROUND}
+
+MAX_CONCURRENT_REQUESTS = 4
+MAX_QUEUED_REQUESTS = 32
+MAX_QUEUE_WAIT_SECONDS = 120.0
+# Used for models with no configured limits
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 6000
+# Completion allowance when the call does not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 512
+CHARS_PER_TOKEN = 4
+RECENT_WAITS = 500
+
+
+class LLMQueueFullError(RuntimeError):
+    """
+    Raised instead of queueing a call when the scheduler is saturated, or when a
+    queued call has waited longer than the scheduler allows.
+    """
+
+
+def estimate_tokens(texts: List[str], max_tokens: Optional[int] = None) -> int:
+    """
+    Rough prompt size (about four characters per token) plus the completion the
+    call may produce. Only used to pace calls; the real usage is settled afterwards.
+    """
+    prompt = sum(len(text) for text in texts) // CHARS_PER_TOKEN
+    return prompt + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def message_texts(messages: list, tools: Optional[list] = None) -> List[str]:
+    texts = [message.content if isinstance(message.content, str) else json.dumps(message.content) for message in messages]
+    if tools:
+        # Bound tool schemas are sent with every request and count against TPM
+        texts.append(json.dumps(tools, default=str))
+    return texts
+
+
+class TokenBucket:
+    """
+    Refills continuously at per_minute / 60 per second up to per_minute. The level
+    may go negative when a call turns out to cost more than estimated; later calls
+    then wait for the debt to be repaid.
+    """
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.per_minute, self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        """
+        Seconds until amount can be taken (0 if it can be taken now). Amounts above
+        the bucket size are clamped so that a single large call is not blocked forever.
+        """
+        self._refill(now)
+        missing = min(amount, self.per_minute) - self.level
+        return max(0.0, missing * 60.0 / self.per_minute)
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= min(amount, self.per_minute)
+
+    def adjust(self, amount: float, now: float):
+        self._refill(now)
+        self.level = min(self.per_minute, self.level - amount)
+
+
+class Ticket:
+    __slots__ = ('order', 'bucket_key', 'tokens', 'queued', 'admitted')
+
+    def __init__(self, order: Tuple[int, int], bucket_key: Tuple[str, str], tokens: int):
+        self.order = order
+        self.bucket_key = bucket_key
+        self.tokens = tokens
+        self.queued = time.monotonic()
+        self.admitted = False
+
+    def __lt__(self, other: "Ticket") -> bool:
+        return self.order < other.order
+
+
+class Slot:
+    """
+    Handed to the caller while its request runs; set used_tokens to the real usage
+    so the TPM bucket can be settled.
+    """
+    __slots__ = ('tokens', 'used_tokens', 'waited')
+
+    def __init__(self, tokens: int, waited: float):
+        self.tokens = tokens
+        self.used_tokens: Optional[int] = None
+        self.waited = waited
+
+
+class LLMScheduler:
+    """
+    Central admission control for Groq calls. Each (API key hash, model) pair has a
+    requests-per-minute and a tokens-per-minute bucket; a call is admitted when both
+    can cover it and fewer than max_concurrent calls are running.
+
+    Waiting calls are served in priority order (interactive before background),
+    first come first served within a class. A call whose buckets are empty does not
+    hold up calls for other keys or models. When max_queued calls are already
+    waiting, new calls fail straight away instead of piling up.
+    """
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS, max_queued: int = MAX_QUEUED_REQUESTS,
+                 max_wait_seconds: float = MAX_QUEUE_WAIT_SECONDS):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_wait_seconds = max_wait_seconds
+        self.limits: Dict[str, Tuple[float, float]] = {}
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._queue: List[Ticket] = []
+        self._buckets: Dict[Tuple[str, str], Tuple[TokenBucket, TokenBucket]] = {}
+        self._active = 0
+        self.counters = {'admitted': 0, 'rejected': 0, 'timed_out': 0, 'max_queue_depth': 0,
+                         'estimated_tokens': 0, 'used_tokens': 0}
+        self._waits: Dict[int, deque] = {priority: deque(maxlen=RECENT_WAITS) for priority in PRIORITY_CLASSES.values()}
+
+    def configure(self, limits: Dict[str, Tuple[float, float]], max_concurrent: int, max_queued: int):
+        """
+        limits maps a model name to its (requests per minute, tokens per minute).
+        Buckets already in use keep their level and pick up the new rates.
+        """
+        with self._condition:
+            self.limits = dict(limits)
+            self.max_concurrent = max_concurrent
+            self.max_queued = max_queued
+            for (_, model), (requests, tokens) in self._buckets.items():
+                requests.per_minute, tokens.per_minute = self._limits_for(model)
+            self._condition.notify_all()
+
+    def _limits_for(self, model: str) -> Tuple[float, float]:
+        return self.limits.get(model, (DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE))
+
+    def _bucket_pair(self, bucket_key: Tuple[str, str]) -> Tuple[TokenBucket, TokenBucket]:
+        if bucket_key not in self._buckets:
+            requests_per_minute, tokens_per_minute = self._limits_for(bucket_key[1])
+            self._buckets[bucket_key] = (TokenBucket(requests_per_minute), TokenBucket(tokens_per_minute))
+        return self._buckets[bucket_key]
+
+    def _dispatch(self, now: float) -> Optional[float]:
+        """
+        Admits every waiting call that can run now, in priority order, and returns
+        how long until a blocked call's buckets refill (None if nothing is waiting
+        on a bucket).
+        """
+        next_refill = None
+        blocked = set()
+        for ticket in list(self._queue):
+            if self._active >= self.max_concurrent:
+                break
+            if ticket.bucket_key in blocked:
+                continue
+            requests, tokens = self._bucket_pair(ticket.bucket_key)
+            wait = max(requests.wait_for(1, now), tokens.wait_for(ticket.tokens, now))
+            if wait > 0:
+                # Later calls for the same key and model queue behind this one
+                blocked.add(ticket.bucket_key)
+                next_refill = wait if next_refill is None else min(next_refill, wait)
+                continue
+            requests.take(1, now)
+            tokens.take(ticket.tokens, now)
+            self._queue.remove(ticket)
+            self._active += 1
+            ticket.admitted = True
+        return next_refill
+
+    def _acquire(self, bucket_key: Tuple[str, str], tokens: int, priority: int) -> float:
+        with self._condition:
+            if len(self._queue) >= self.max_queued:
+                self.counters['rejected'] += 1
+                raise LLMQueueFullError(f"{len(self._queue)} LLM calls are already waiting; try again shortly")
+            ticket = Ticket((priority, next(self._sequence)), bucket_key, tokens)
+            bisect.insort(self._queue, ticket)
+            self.counters['max_queue_depth'] = max(self.counters['max_queue_depth'], len(self._queue))
+            deadline = ticket.queued + self.max_wait_seconds
+            while True:
+                now = time.monotonic()
+                next_refill = self._dispatch(now)
+                if ticket.admitted:
+                    break
+                if now >= deadline:
+                    self._queue.remove(ticket)
+                    self.counters['timed_out'] += 1
+                    self._condition.notify_all()
+                    raise LLMQueueFullError(f"LLM call waited {now - ticket.queued:.0f}s for a rate limit slot")
+                timeout = deadline - now if next_refill is None else min(next_refill, deadline - now)
+                self._condition.wait(timeout)
+            waited = time.monotonic() - ticket.queued
+            self.counters['admitted'] += 1
+            self.counters['estimated_tokens'] += tokens
+            self._waits.setdefault(priority, deque(maxlen=RECENT_WAITS)).append(waited)
+            # Someone else may be admissible too (another key, or spare concurrency)
+            self._condition.notify_all()
+            return waited
+
+    def _release(self, bucket_key: Tuple[str, str], slot: Slot):
+        with self._condition:
+            self._active -= 1
+            if slot.used_tokens is not None:
+                self.counters['used_tokens'] += slot.used_tokens
+                self._bucket_pair(bucket_key)[1].adjust(slot.used_tokens - slot.tokens, time.monotonic())
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, key_hash: str, model: str, tokens: int, priority: int = INTERACTIVE) -> Iterator[Slot]:
+        """
+        Blocks until the call may be sent, then holds a concurrency slot for the
+        duration of the with block.
+        """
+        bucket_key = (key_hash, model)
+        slot = Slot(tokens, self._acquire(bucket_key, tokens, priority))
+        try:
+            yield slot
+        finally:
+            self._release(bucket_key, slot)
+
+    def stats(self) -> Dict:
+        with self._condition:
+            counters = dict(self.counters)
+            queued, active = len(self._queue), self._active
+            waits = {priority: sorted(values) for priority, values in self._waits.items()}
+        names = {priority: name for name, priority in PRIORITY_CLASSES.items()}
+        summary = {'queued': queued, 'active': active, **counters}
+        for priority, values in waits.items():
+            name = names.get(priority, str(priority))
+            summary[f'{name}_mean_wait_s'] = sum(values) / len(values) if values else 0.0
+            summary[f'{name}_p95_wait_s'] = values[int(0.95 * (len(values) - 1))] if values else 0.0
+        return summary
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,262 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from src.langgraphagenticai.LLMS.rate_limiter import LLMQueueFullError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+MAX_ATTEMPTS_PER_MODEL = 3
+BASE_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 8.0
+# Hedging needs a p95 worth trusting
+MIN_HEDGE_SAMPLES = 20
+RECENT_CALLS = 200
+CIRCUIT_FAILURES = 3
+CIRCUIT_COOLDOWN_SECONDS = 60.0
+HEDGE_WORKERS = 8
+
+# Worth retrying on the same model: overloaded, rate limited or a dropped connection
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+TRANSIENT_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError', 'ConnectTimeout', 'ReadTimeout', 'RemoteProtocolError'}
+# Specific to the model (unknown, decommissioned, or at capacity here): go straight to the next one
+FAILOVER_STATUS_CODES = {404, 413, 422}
+
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='llm-hedge')
+
+
+def classify_error(error: Exception) -> str:
+    """
+    'retry' for transient errors, 'failover' for errors that another model may not
+    have, and 'fatal' for everything else (bad API key, malformed request), which
+    no other model would fix.
+    """
+    if isinstance(error, LLMQueueFullError):
+        return 'failover'
+    status_code = getattr(error, 'status_code', None)
+    if status_code in TRANSIENT_STATUS_CODES:
+        return 'retry'
+    if status_code in FAILOVER_STATUS_CODES:
+        return 'failover'
+    if type(error).__name__ in TRANSIENT_ERROR_NAMES or isinstance(error, (TimeoutError, ConnectionError)):
+        return 'retry'
+    return 'fatal'
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class Attempt:
+    """
+    One request to one model. A call that waits for admission (the LLM scheduler)
+    calls admitted() just before sending, so the request is only timed, and only
+    hedged, from then on. A call that never calls it is timed from the start and
+    never hedged.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.is_admitted = False
+        self._event = threading.Event()
+
+    def admitted(self):
+        self.started = time.perf_counter()
+        self.is_admitted = True
+        self._event.set()
+
+    def finished(self):
+        self._event.set()
+
+    def wait(self):
+        """
+        Blocks until the request is admitted or has finished.
+        """
+        self._event.wait()
+
+
+class ModelHealth:
+    """
+    Recent latencies and outcomes for one model. A model that fails
+    CIRCUIT_FAILURES times in a row is skipped until the cooldown has passed.
+    """
+    def __init__(self, recent_calls: int = RECENT_CALLS):
+        self.latencies = deque(maxlen=recent_calls)
+        self.outcomes = deque(maxlen=recent_calls)
+        self.counters = {'calls': 0, 'errors': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0}
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record(self, seconds: Optional[float], ok: bool, now: float):
+        self.counters['calls'] += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(seconds)
+            self.consecutive_failures = 0
+            return
+        self.counters['errors'] += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= CIRCUIT_FAILURES:
+            self.open_until = now + CIRCUIT_COOLDOWN_SECONDS
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def snapshot(self, now: float) -> Dict:
+        ordered = sorted(self.latencies)
+        return {
+            **self.counters,
+            'error_rate': self.error_rate(),
+            'p50_s': ordered[int(0.5 * (len(ordered) - 1))] if ordered else None,
+            'p95_s': ordered[int(0.95 * (len(ordered) - 1))] if ordered else None,
+            'circuit_open': self.open_until > now,
+        }
+
+
+class ResilientInvoker:
+    """
+    Runs an LLM call against a chain of models: the selected model first, then the
+    configured fallbacks in their configured order. Models whose circuit is open are
+    skipped, unless every model's is.
+
+    Transient errors are retried on the same model with full-jitter exponential
+    backoff; a Retry-After longer than the backoff cap, or a model-specific error,
+    moves on to the next model at once. With hedging on, a request still running
+    the model's p95 latency after it was sent gets a duplicate, and whichever
+    answers first wins (the other runs to completion in the background and is
+    discarded). Time spent queued for admission is neither timed nor hedged, and a
+    call turned away by the scheduler does not count against the model's health.
+    """
+    def __init__(self, max_attempts: int = MAX_ATTEMPTS_PER_MODEL, hedge: bool = False):
+        self.max_attempts = max_attempts
+        self.hedge = hedge
+        self._lock = threading.Lock()
+        self._health: Dict[str, ModelHealth] = {}
+        # fallbacks: calls answered by a model other than the selected one
+        self.counters = {'invocations': 0, 'fallbacks': 0, 'exhausted': 0}
+
+    def configure(self, max_attempts: int, hedge: bool):
+        self.max_attempts = max_attempts
+        self.hedge = hedge
+
+    def _model_health(self, model: str) -> ModelHealth:
+        if model not in self._health:
+            self._health[model] = ModelHealth()
+        return self._health[model]
+
+    def _order(self, models: List[str]) -> List[str]:
+        now = time.monotonic()
+        models = list(dict.fromkeys(models))
+        with self._lock:
+            healthy = [model for model in models if self._model_health(model).open_until <= now]
+        # With every circuit open there is nothing better to do than try them anyway
+        return healthy or models
+
+    def _timed(self, model: str, call: Callable[[str, Attempt], T], attempt: Optional[Attempt] = None) -> T:
+        attempt = attempt or Attempt()
+        try:
+            result = call(model, attempt)
+        except LLMQueueFullError:
+            # Turned away before the request was sent: says nothing about the model
+            raise
+        except Exception:
+            with self._lock:
+                self._model_health(model).record(None, False, time.monotonic())
+            raise
+        finally:
+            attempt.finished()
+        with self._lock:
+            self._model_health(model).record(time.perf_counter() - attempt.started, True, time.monotonic())
+        return result
+
+    def _hedged(self, model: str, call: Callable[[str, Attempt], T]) -> T:
+        with self._lock:
+            delay = self._model_health(model).p95()
+        if not self.hedge or delay is None:
+            return self._timed(model, call)
+        attempt = Attempt()
+        first = _hedge_executor.submit(self._timed, model, call, attempt)
+        # The hedge delay runs from when the request was sent, not from when it was queued
+        attempt.wait()
+        if not attempt.is_admitted:
+            return first.result()
+        done, _ = wait([first], timeout=max(0.0, attempt.started + delay - time.perf_counter()))
+        if done:
+            return first.result()
+        with self._lock:
+            self._model_health(model).counters['hedges'] += 1
+        second = _hedge_executor.submit(self._timed, model, call)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self._model_health(model).counters['hedge_wins'] += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def invoke(self, models: List[str], call: Callable[[str, Attempt], T]) -> T:
+        """
+        call(model, attempt) sends the request to that model, calling
+        attempt.admitted() first if it had to wait for admission. Raises the last
+        error once every model in the chain has failed.
+        """
+        with self._lock:
+            self.counters['invocations'] += 1
+        error = None
+        for position, model in enumerate(self._order(models)):
+            if position:
+                logger.warning("Falling back to %s after: %s", model, error)
+            for attempt in range(self.max_attempts):
+                try:
+                    result = self._hedged(model, call)
+                except Exception as e:
+                    error = e
+                    kind = classify_error(e)
+                    if kind == 'fatal':
+                        raise
+                    retry_after = retry_after_seconds(e)
+                    if kind == 'failover' or attempt + 1 == self.max_attempts or (retry_after or 0) > MAX_BACKOFF_SECONDS:
+                        break
+                    delay = random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt))
+                    with self._lock:
+                        self._model_health(model).counters['retries'] += 1
+                    time.sleep(max(delay, retry_after or 0))
+                    continue
+                if model != models[0]:
+                    with self._lock:
+                        self.counters['fallbacks'] += 1
+                return result
+        with self._lock:
+            self.counters['exhausted'] += 1
+        raise error
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                **self.counters,
+                'models': {model: health.snapshot(now) for model, health in self._health.items()},
+            }
+
+
+resilient_invoker = ResilientInvoker()
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from src.langgraphagenticai.stores.sqlite_store import SQLiteConnectionPool
+
+RESPONSE_CACHE_PATH = './.llm_cache/responses.sqlite3'
+MEMORY_ENTRIES = 512
+PURGE_EVERY_STORES = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    use_case TEXT NOT NULL,
+    generations TEXT NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires);
+"""
+SELECT_RESPONSE = "SELECT generations, expires FROM responses WHERE key = ?"
+UPSERT_RESPONSE = """
+INSERT INTO responses (key, use_case, generations, created, expires) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET use_case = excluded.use_case, generations = excluded.generations,
+    created = excluded.created, expires = excluded.expires
+"""
+PURGE_EXPIRED = "DELETE FROM responses WHERE expires < ?"
+
+# Per-message fields that change on every run without changing what was asked
+VOLATILE_MESSAGE_FIELDS = ('id', 'response_metadata', 'usage_metadata')
+# generation_info key naming the fallback model that produced a generation; such
+# answers are not stored under the key of the model that was asked
+FALLBACK_MODEL_INFO = 'fallback_model'
+
+
+def _normalise(node: Any) -> Any:
+    if isinstance(node, dict):
+        if node.get('type') == 'constructor' and isinstance(node.get('kwargs'), dict):
+            kwargs = {key: value for key, value in node['kwargs'].items() if key not in VOLATILE_MESSAGE_FIELDS}
+            return {**node, 'kwargs': _normalise(kwargs)}
+        return {key: _normalise(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_normalise(value) for value in node]
+    if isinstance(node, str):
+        return node.strip()
+    return node
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """
+    Hash of the serialised messages (minus run-specific ids and metadata) and the
+    llm_string, which already covers the model, its parameters and any bound tool
+    schemas.
+    """
+    try:
+        prompt = json.dumps(_normalise(json.loads(prompt)), sort_keys=True, ensure_ascii=False)
+    except ValueError:
+        pass
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode('utf-8')).hexdigest()
+
+
+class ResponseCacheStore:
+    """
+    Two-tier store for LLM responses: an in-memory LRU of recent entries in front of
+    a SQLite table that survives restarts and is shared by worker processes. Entries
+    carry their own expiry, so use cases with different TTLs share one store.
+    """
+    def __init__(self, path: str = RESPONSE_CACHE_PATH, memory_entries: int = MEMORY_ENTRIES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pool = None
+        self._stores = 0
+        self._pending: Dict[str, float] = {}
+        self.counters: Dict[str, Dict[str, float]] = {}
+
+    def _connections(self) -> SQLiteConnectionPool:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    pool = SQLiteConnectionPool(self.path, 2)
+                    with pool.connection() as connection:
+                        connection.executescript(SCHEMA)
+                    self._pool = pool
+        return self._pool
+
+    def _count(self, use_case: str, name: str, amount: float = 1):
+        with self._lock:
+            counters = self.counters.setdefault(use_case, {
+                'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                'lookup_seconds': 0.0, 'miss_seconds': 0.0, 'timed_misses': 0,
+            })
+            counters[name] += amount
+
+    def _remember(self, key: str, generations: str, expires: float):
+        with self._lock:
+            self._memory[key] = (generations, expires)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str, use_case: str) -> Optional[str]:
+        started = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+        tier = 'memory_hits'
+        if entry is None:
+            tier = 'disk_hits'
+            with self._connections().connection() as connection:
+                row = connection.execute(SELECT_RESPONSE, (key,)).fetchone()
+            if row is not None and row['expires'] > now:
+                entry = (row['generations'], row['expires'])
+                self._remember(key, *entry)
+        self._count(use_case, 'lookup_seconds', time.perf_counter() - started)
+        if entry is None:
+            self._count(use_case, 'misses')
+            with self._lock:
+                self._pending[key] = started
+                if len(self._pending) > self.memory_entries:
+                    # A miss whose call failed is never stored; forget the oldest
+                    self._pending.pop(next(iter(self._pending)))
+            return None
+        self._count(use_case, tier)
+        return entry[0]
+
+    def put(self, key: str, use_case: str, generations: str, ttl: float):
+        now = time.time()
+        self._remember(key, generations, now + ttl)
+        with self._connections().transaction() as connection:
+            connection.execute(UPSERT_RESPONSE, (key, use_case, generations, now, now + ttl))
+            with self._lock:
+                self._stores += 1
+                purge = self._stores % PURGE_EVERY_STORES == 0
+                missed_at = self._pending.pop(key, None)
+            if purge:
+                connection.execute(PURGE_EXPIRED, (now,))
+        self._count(use_case, 'stores')
+        if missed_at is not None:
+            # Time from the miss to the response being stored is what a hit would have saved
+            self._count(use_case, 'miss_seconds', time.perf_counter() - missed_at)
+            self._count(use_case, 'timed_misses')
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._connections().transaction() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            counters = {use_case: dict(values) for use_case, values in self.counters.items()}
+        summary = {}
+        for use_case, values in counters.items():
+            hits = values['memory_hits'] + values['disk_hits']
+            lookups = hits + values['misses']
+            mean_miss = values['miss_seconds'] / values['timed_misses'] if values['timed_misses'] else 0.0
+            summary[use_case] = {
+                'lookups': lookups,
+                'memory_hits': values['memory_hits'],
+                'disk_hits': values['disk_hits'],
+                'misses': values['misses'],
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'mean_lookup_seconds': values['lookup_seconds'] / lookups if lookups else 0.0,
+                'mean_miss_seconds': mean_miss,
+                'estimated_seconds_saved': hits * mean_miss,
+            }
+        return summary
+
+
+class UseCaseResponseCache(BaseCache):
+    """
+    LangChain cache for one use case: exact-match lookups in a shared
+    ResponseCacheStore, stored with that use case's TTL.
+    """
+    def __init__(self, store: ResponseCacheStore, use_case: str, ttl: float):
+        self.store = store
+        self.use_case = use_case
+        self.ttl = ttl
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        generations = self.store.get(cache_key(prompt, llm_string), self.use_case)
+        if generations is None:
+            return None
+        generations = [loads(generation) for generation in json.loads(generations)]
+        for generation in generations:
+            # A fresh message each time, so the graph appends it rather than replacing an earlier one
+            message = getattr(generation, 'message', None)
+            if message is not None:
+                message.id = None
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if any(FALLBACK_MODEL_INFO in (generation.generation_info or {}) for generation in return_val):
+            return
+        generations = json.dumps([dumps(generation) for generation in return_val])
+        self.store.put(cache_key(prompt, llm_string), self.use_case, generations, self.ttl)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+response_cache_store = ResponseCacheStore()
+
+
+def response_cache_for(use_case: str, ttls: Dict[str, float]) -> Optional[UseCaseResponseCache]:
+    """
+    The cache to attach to the model for a use case, or None if the use case has no
+    TTL configured (or a TTL of 0) and so opts out.
+    """
+    ttl = ttls.get(use_case, 0)
+    if ttl <= 0:
+        return None
+    return UseCaseResponseCache(response_cache_store, use_case, ttl)
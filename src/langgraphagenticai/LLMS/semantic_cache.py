@@ -0,0 +1,255 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from src.langgraphagenticai.vectorstores.hybrid_retriever import STOPWORDS
+from src.langgraphagenticai.vectorstores.local_embedder import HashingEmbeddingFunction
+
+SEMANTIC_CACHE_ENTRIES = 1024
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+DEFAULT_TTL_SECONDS = 3600.0
+# Above this the new question is treated as a repeat and replaces the stored answer
+DUPLICATE_SIMILARITY = 0.995
+# Words that change how a question is phrased but not what it asks
+FILLER_WORDS = STOPWORDS | frozenset("""
+any also just kind kinds type types sort sorts please some there have has whats
+""".split())
+
+
+def content_words(text: str) -> FrozenSet[str]:
+    """
+    The words a cached answer has to agree on, lightly normalised: negations are
+    spelled out (so "isn't" keeps its "not"), plurals and -ise/-ize spellings are
+    folded, and filler words are dropped.
+    """
+    text = re.sub(r"n't\b", " not", text.lower().replace("cannot", "can not")).replace("'", "")
+    words = set()
+    for word in re.findall(r"[a-z0-9]+", text):
+        if word in FILLER_WORDS:
+            continue
+        word = re.sub(r"is(e|ed|es|ing|ation)$", r"iz\1", word)
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.add(word)
+    return frozenset(words)
+
+
+class SemanticIndex:
+    """
+    Fixed-capacity vector index of (question, answer) pairs. Vectors live in one
+    preallocated matrix so a lookup is a single matrix-vector product; when every
+    slot is taken the least recently used entry is overwritten.
+    Not thread-safe on its own: SemanticCache holds its lock around every call.
+    """
+    def __init__(self, dimension: int, capacity: int = SEMANTIC_CACHE_ENTRIES):
+        self.capacity = capacity
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self._used = np.zeros(capacity, dtype=bool)
+        # Slot -> (question, answer, content words, time stored), oldest use first
+        self._entries: "OrderedDict[int, Tuple[str, str, FrozenSet[str], float]]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _scores(self, vector: np.ndarray) -> np.ndarray:
+        scores = self._vectors @ vector
+        scores[~self._used] = -1.0
+        return scores
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if not self._entries:
+            return None, 0.0
+        scores = self._scores(vector)
+        slot = int(np.argmax(scores))
+        return slot, float(scores[slot])
+
+    def candidates(self, vector: np.ndarray, threshold: float) -> List[Tuple[int, float]]:
+        """
+        Slots scoring at least threshold, most similar first.
+        """
+        if not self._entries:
+            return []
+        scores = self._scores(vector)
+        slots = np.flatnonzero(scores >= threshold)
+        return [(int(slot), float(scores[slot])) for slot in slots[np.argsort(-scores[slots])]]
+
+    def peek(self, slot: int) -> Tuple[str, str, FrozenSet[str], float]:
+        return self._entries[slot]
+
+    def get(self, slot: int) -> Tuple[str, str, FrozenSet[str], float]:
+        self._entries.move_to_end(slot)
+        return self._entries[slot]
+
+    def remove(self, slot: int):
+        del self._entries[slot]
+        self._used[slot] = False
+        self.expirations += 1
+
+    def add(self, vector: np.ndarray, question: str, answer: str, now: float):
+        slot, score = self.nearest(vector)
+        if slot is None or score < DUPLICATE_SIMILARITY:
+            if len(self._entries) < self.capacity:
+                slot = int(np.argmin(self._used))
+            else:
+                slot, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+        self._vectors[slot] = vector
+        self._used[slot] = True
+        self._entries[slot] = (question, answer, content_words(question), now)
+        self._entries.move_to_end(slot)
+
+
+class SemanticCache:
+    """
+    Answers keyed by what the user asked rather than by the exact prompt, so
+    paraphrases of a question already answered skip the LLM call. User turns are
+    embedded with the local hashing embedder and matched by cosine similarity
+    against one SemanticIndex per (use case, model, source version).
+
+    The hashing embedder scores one-word swaps and negations ("roses" for "tulips",
+    "do" for "don't") close to the original, so with match_content_words a hit also
+    needs the same content words as the stored question. Entries expire after
+    ttl_seconds; a new source version (say, an edited FAQ file) drops the entries
+    answered from the old one.
+
+    Only answers that depend on the question alone should be stored: callers decide
+    that, the cache only matches text.
+    """
+    def __init__(self, embedding_function: Optional[HashingEmbeddingFunction] = None, capacity: int = SEMANTIC_CACHE_ENTRIES,
+                 match_content_words: bool = True):
+        self.embedding_function = embedding_function or HashingEmbeddingFunction()
+        self.capacity = capacity
+        self.match_content_words = match_content_words
+        self._lock = threading.Lock()
+        self._indexes: Dict[Tuple[str, str, Optional[str]], SemanticIndex] = {}
+        self.counters: Dict[str, Dict[str, float]] = {}
+
+    def _index(self, use_case: str, model_name: str, version: Optional[str]) -> SemanticIndex:
+        key = (use_case, model_name, version)
+        if key not in self._indexes:
+            for stale in [other for other in self._indexes if other[:2] == key[:2]]:
+                del self._indexes[stale]
+            self._indexes[key] = SemanticIndex(self.embedding_function.dimension, self.capacity)
+        return self._indexes[key]
+
+    def _count(self, use_case: str, name: str, amount: float = 1):
+        counters = self.counters.setdefault(use_case, {
+            'hits': 0, 'misses': 0, 'stores': 0, 'lookup_seconds': 0.0,
+            'miss_seconds': 0.0, 'timed_misses': 0, 'similarity': 0.0,
+        })
+        counters[name] += amount
+
+    def lookup(self, use_case: str, model_name: str, question: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+               ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS, version: Optional[str] = None) -> Optional[str]:
+        started = time.perf_counter()
+        vector = self.embedding_function.embed(question)
+        words = content_words(question) if self.match_content_words else None
+        now = time.monotonic()
+        answer = score = None
+        with self._lock:
+            index = self._index(use_case, model_name, version)
+            for slot, similarity in index.candidates(vector, threshold):
+                _, _, stored_words, stored_at = index.peek(slot)
+                if ttl_seconds is not None and now - stored_at > ttl_seconds:
+                    index.remove(slot)
+                    continue
+                if words is None or words == stored_words:
+                    answer, score = index.get(slot)[1], similarity
+                    break
+            self._count(use_case, 'lookup_seconds', time.perf_counter() - started)
+            if answer is None:
+                self._count(use_case, 'misses')
+            else:
+                self._count(use_case, 'hits')
+                self._count(use_case, 'similarity', score)
+        return answer
+
+    def store(self, use_case: str, model_name: str, question: str, answer: str, llm_seconds: Optional[float] = None,
+              version: Optional[str] = None):
+        """
+        llm_seconds is how long the call that produced the answer took; it is what a
+        later hit is estimated to save.
+        """
+        vector = self.embedding_function.embed(question)
+        with self._lock:
+            self._index(use_case, model_name, version).add(vector, question, answer, time.monotonic())
+            self._count(use_case, 'stores')
+            if llm_seconds is not None:
+                self._count(use_case, 'miss_seconds', llm_seconds)
+                self._count(use_case, 'timed_misses')
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            counters = {use_case: dict(values) for use_case, values in self.counters.items()}
+            entries: Dict[str, List[int]] = {}
+            for (use_case, _, _), index in self._indexes.items():
+                entries.setdefault(use_case, [0, 0, 0])
+                entries[use_case][0] += len(index)
+                entries[use_case][1] += index.evictions
+                entries[use_case][2] += index.expirations
+        summary = {}
+        for use_case, values in counters.items():
+            lookups = values['hits'] + values['misses']
+            mean_miss = values['miss_seconds'] / values['timed_misses'] if values['timed_misses'] else 0.0
+            stored, evictions, expirations = entries.get(use_case, (0, 0, 0))
+            summary[use_case] = {
+                'lookups': lookups,
+                'hits': values['hits'],
+                'misses': values['misses'],
+                'hit_rate': values['hits'] / lookups if lookups else 0.0,
+                'mean_hit_similarity': values['similarity'] / values['hits'] if values['hits'] else 0.0,
+                'entries': stored,
+                'evictions': evictions,
+                'expirations': expirations,
+                'mean_lookup_seconds': values['lookup_seconds'] / lookups if lookups else 0.0,
+                'mean_miss_seconds': mean_miss,
+                'estimated_seconds_saved': values['hits'] * mean_miss,
+            }
+        return summary
+
+
+class UseCaseSemanticCache:
+    """
+    SemanticCache bound to one use case, model, similarity threshold, TTL and source
+    version, as handed to the graph nodes.
+    """
+    def __init__(self, cache: SemanticCache, use_case: str, model_name: str, threshold: float,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS, version: Optional[str] = None):
+        self.cache = cache
+        self.use_case = use_case
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+
+    def lookup(self, question: str) -> Optional[str]:
+        return self.cache.lookup(self.use_case, self.model_name, question, self.threshold, self.ttl_seconds, self.version)
+
+    def store(self, question: str, answer: str, llm_seconds: Optional[float] = None):
+        self.cache.store(self.use_case, self.model_name, question, answer, llm_seconds, self.version)
+
+
+semantic_cache = SemanticCache()
+
+
+def semantic_cache_for(use_case: str, model_name: str, use_cases: List[str], threshold: float,
+                       ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS, version: Optional[str] = None) -> Optional[UseCaseSemanticCache]:
+    """
+    The semantic cache for a use case, or None if the use case is not listed in
+    use_cases and so opts out. version identifies the data the answers were drawn
+    from (e.g. a hash of the FAQ file); answers stored under another version are
+    never returned.
+    """
+    if use_case not in use_cases:
+        return None
+    return UseCaseSemanticCache(semantic_cache, use_case, model_name, threshold, ttl_seconds, version)
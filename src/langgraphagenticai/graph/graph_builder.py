@@ -17,6 +17,10 @@ from src.langgraphagenticai.node.chatbot_with_tool_node import ChatbotWithToolNo
 from src.langgraphagenticai.node.basic_chatbot_node import BasicChatbotNode
 from src.langgraphagenticai.state.state import State , SDLCState
 from src.langgraphagenticai.node.travel_planner_node import TravelPlannerNode
+from src.langgraphagenticai.ui.uiconfigfile import Config
+from src.langgraphagenticai.LLMS.semantic_cache import semantic_cache_for
+from src.langgraphagenticai.vectorstores.ingestion import file_hash
+from src.langgraphagenticai.vectorstores.vectore_store import FAQ_FILE_PATH
 
 class GraphBuilder:
     """
@@ -26,6 +30,7 @@ class GraphBuilder:
         self.llm = model
         self.graph_builder = StateGraph(State)
         self.sdlc_graph_builder = StateGraph(SDLCState)
+        self.semantic_cache = None
         
     def basic_chatbot_build_graph(self):
         """
@@ -35,7 +40,7 @@ class GraphBuilder:
         and integrates it into the graph. The chatbot node is set as both the 
         entry and exit point of the graph.
         """
-        self.basic_chatbot_node = BasicChatbotNode(self.llm)
+        self.basic_chatbot_node = BasicChatbotNode(self.llm, semantic_cache=self.semantic_cache)
         self.graph_builder.add_node("chatbot", self.basic_chatbot_node.process)
         self.graph_builder.set_entry_point("chatbot")
         self.graph_builder.set_finish_point("chatbot")
@@ -139,7 +144,8 @@ class GraphBuilder:
         self.graph_builder.set_entry_point("agent")
 
     def customer_support_build_graph(self):
-        obj_cs_bot = Customer_Support_Bot(llm=self.llm)
+        obj_cs_bot = Customer_Support_Bot(llm=self.llm, speculative_retrieval=Config().get_customer_support_speculative_retrieval(),
+                                          semantic_cache=self.semantic_cache)
         self.graph_builder = obj_cs_bot.chat_bot()
         
     def ai_news_build_graph(self):
@@ -301,6 +307,12 @@ class GraphBuilder:
         """
         Sets up the graph for the selected use case.
         """
+        config = Config()
+        # Customer Support answers come from the FAQ, so an edited FAQ file starts a fresh cache
+        version = file_hash(FAQ_FILE_PATH) if usecase == "Customer Support" else None
+        self.semantic_cache = semantic_cache_for(usecase, getattr(self.llm, 'model_name', ''),
+                                                 config.get_semantic_cache_use_cases(), config.get_semantic_cache_threshold(),
+                                                 config.get_semantic_cache_ttl_seconds(), version)
         if usecase == "Basic Chatbot":
             self.basic_chatbot_build_graph()
         elif usecase == "Chatbot with Tool":
@@ -2,6 +2,7 @@ from src.langgraphagenticai.ui.streamlitui.display_result import DisplayResultSt
 from src.langgraphagenticai.LLMS.groqllm import GroqLLM
 from src.langgraphagenticai.graph.graph_builder import GraphBuilder
 from src.langgraphagenticai.ui.streamlitui.loadui import LoadStreamlitUI
+from src.langgraphagenticai.warmup import start_warmup
 
 import streamlit as st
 import json
@@ -18,7 +19,9 @@ def load_langgraph_agenticai_app():
     implementing exception handling for robustness.
     """
     try:
-        
+        # Preload the vector store and embedding model in the background (no-op after the first run)
+        start_warmup()
+
         # Load UI
         ui = LoadStreamlitUI()
         user_input = ui.load_streamlit_ui()
@@ -1,3 +1,6 @@
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
 
 from src.langgraphagenticai.state.state import State
 
@@ -5,11 +8,25 @@ class BasicChatbotNode:
     """
     Basic chatbot logic implementation.
     """
-    def __init__(self,model):
+    def __init__(self,model, semantic_cache=None):
         self.llm = model
+        # Answers to earlier paraphrases of the same question, or None when disabled
+        self.semantic_cache = semantic_cache
 
     def process(self, state: State) -> dict:
         """
         Processes the input state and generates a chatbot response.
         """
-        return {"messages":self.llm.invoke(state['messages'])}
+        messages = state['messages']
+        # Only a standalone question can be answered from the cache; with history the answer depends on context
+        question = messages[0].content if self.semantic_cache and len(messages) == 1 and isinstance(messages[0], HumanMessage) else None
+        if question:
+            answer = self.semantic_cache.lookup(question)
+            if answer is not None:
+                return {"messages": AIMessage(content=answer)}
+
+        started = time.perf_counter()
+        response = self.llm.invoke(messages)
+        if question and response.content:
+            self.semantic_cache.store(question, response.content, time.perf_counter() - started)
+        return {"messages":response}
@@ -1,14 +1,22 @@
 from langgraph.graph import StateGraph, MessagesState
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.prebuilt import ToolNode
+from src.langgraphagenticai.node.speculative_retrieval import SpeculativeRetriever
 from src.langgraphagenticai.tools.customer_support_tools import query_knowledge_base, search_for_product_reccommendations, data_protection_check, create_new_customer, place_order, retrieve_existing_customer_orders
 
 import os
+import time
 
 
 class Customer_Support_Bot:
-    def __init__(self,llm):
+    def __init__(self,llm, speculative_retrieval=False, semantic_cache=None):
         self.llm = llm
+        # Start FAQ and product lookups for the user's message alongside the first agent call
+        self.speculative_retrieval = speculative_retrieval
+        # Answers to earlier paraphrases of the same FAQ question, or None when disabled
+        self.semantic_cache = semantic_cache
+        self.turn_started = time.perf_counter()
         
         
     def chat_bot(self):
@@ -43,11 +51,44 @@ class Customer_Support_Bot:
 
         llm_with_prompt = chat_template | llm.bind_tools(tools)
 
+        speculator = None
+        if self.speculative_retrieval:
+            speculator = SpeculativeRetriever([query_knowledge_base, search_for_product_reccommendations])
+            tools = [speculator.wrap(tool) for tool in tools]
+
+
+        semantic_cache = self.semantic_cache
+
+        def cacheable_question(messages):
+            # A standalone question whose answer came from the FAQ alone, never from customer or order data
+            if not isinstance(messages[0], HumanMessage) or any(isinstance(m, HumanMessage) for m in messages[1:]):
+                return None
+            tools_used = {m.name for m in messages if isinstance(m, ToolMessage)}
+            return messages[0].content if tools_used == {query_knowledge_base.name} else None
 
         def call_agent(message_state: MessagesState):
-            
+            messages = message_state['messages']
+            last_message = messages[-1]
+            if semantic_cache and len(messages) == 1 and isinstance(last_message, HumanMessage):
+                answer = semantic_cache.lookup(last_message.content)
+                if answer is not None:
+                    return {'messages': [AIMessage(content=answer)]}
+
+            if isinstance(last_message, HumanMessage):
+                self.turn_started = time.perf_counter()
+                if speculator:
+                    speculator.start_turn(last_message.content)
+
             response = llm_with_prompt.invoke(message_state)
 
+            if speculator and not response.tool_calls:
+                speculator.end_turn()
+
+            if semantic_cache and not response.tool_calls and response.content:
+                question = cacheable_question(messages)
+                if question:
+                    semantic_cache.store(question, response.content, time.perf_counter() - self.turn_started)
+
             return {
                 'messages': [response]
             }
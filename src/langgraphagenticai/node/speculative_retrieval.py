@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from src.langgraphagenticai.vectorstores.hybrid_retriever import speculative_lookup, tokenize
+
+logger = logging.getLogger(__name__)
+
+SPECULATION_WORKERS = 4
+RECENT_TURNS = 100
+# Jaccard overlap of the tool query's terms and the user's message terms needed for
+# the speculative lookup to stand in for it
+QUERY_MATCH_THRESHOLD = 0.8
+
+_executor = ThreadPoolExecutor(max_workers=SPECULATION_WORKERS, thread_name_prefix='speculative-retrieval')
+
+
+class Speculation(NamedTuple):
+    future: Future
+    started: float
+    finished: List[float]
+    terms: frozenset
+
+
+def query_match(query: str, terms: frozenset) -> float:
+    """
+    Jaccard overlap of query's terms and terms: 1.0 only when they are the same
+    set, so a query that narrows the message to a few of its terms does not match.
+    A query with no terms matches nothing.
+    """
+    query_terms = set(tokenize(query))
+    if not query_terms:
+        return 0.0
+    return len(query_terms & terms) / len(query_terms | terms)
+
+
+def run_speculatively(func, query: str):
+    token = speculative_lookup.set(True)
+    try:
+        return func(query)
+    finally:
+        speculative_lookup.reset(token)
+
+
+class SpeculationStats:
+    """
+    Process-wide counters for speculative retrieval: how often a lookup the model
+    asked for was already running, and how much of each turn that saved.
+    """
+    def __init__(self, recent_turns: int = RECENT_TURNS):
+        self._lock = threading.Lock()
+        self.counters = {'speculations': 0, 'hits': 0, 'misses': 0, 'wasted': 0, 'turns': 0}
+        self.tools: Dict[str, Dict[str, int]] = {}
+        self.saved_seconds = 0.0
+        self.turn_seconds = 0.0
+        self.recent_turns = deque(maxlen=recent_turns)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def count_lookup(self, tool_name: str, hit: bool):
+        outcome = 'hits' if hit else 'misses'
+        with self._lock:
+            self.counters[outcome] += 1
+            self.tools.setdefault(tool_name, {'hits': 0, 'misses': 0})[outcome] += 1
+
+    def record_turn(self, seconds: float, saved: float, hits: int, lookups: int):
+        with self._lock:
+            self.counters['turns'] += 1
+            self.turn_seconds += seconds
+            self.saved_seconds += saved
+            self.recent_turns.append({'seconds': seconds, 'saved_seconds': saved, 'hits': hits, 'lookups': lookups})
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            tools = {name: dict(values) for name, values in self.tools.items()}
+            saved, turn_seconds = self.saved_seconds, self.turn_seconds
+        lookups = counters['hits'] + counters['misses']
+        turns = counters['turns']
+        return {
+            **counters,
+            'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+            'mean_turn_seconds': turn_seconds / turns if turns else 0.0,
+            'mean_saved_seconds_per_turn': saved / turns if turns else 0.0,
+            'tools': {
+                name: {**values, 'hit_rate': values['hits'] / (values['hits'] + values['misses'])}
+                for name, values in tools.items()
+            },
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+class SpeculativeRetriever:
+    """
+    Starts read-only lookups for the user's message while the agent is still deciding
+    what to do, and answers the agent's tool call from that result when it asks for
+    a matching lookup: the same tool, with a query whose terms mostly come from the
+    user's message (the model tends to trim the message down to keywords rather than
+    pass it on verbatim). Hits and misses are counted per tool.
+
+    Speculative lookups run with speculative_lookup set, so the FAQ retriever keeps
+    them out of its path statistics.
+
+    Only side-effect-free tools should be wrapped: a speculative call that is never
+    used is simply thrown away.
+    """
+    def __init__(self, tools: List[BaseTool], stats: SpeculationStats = speculation_stats):
+        self.tools = {tool.name: tool for tool in tools}
+        self.stats = stats
+        self._lock = threading.Lock()
+        # Tool name -> the lookup started for this turn's message
+        self._speculations: Dict[str, Speculation] = {}
+        self._turn_started: Optional[float] = None
+        self._turn_saved = 0.0
+        self._turn_hits = 0
+        self._turn_lookups = 0
+
+    def _submit(self, tool: BaseTool, query: str) -> Speculation:
+        finished = []
+        started = time.perf_counter()
+        future = _executor.submit(run_speculatively, tool.func, query)
+        future.add_done_callback(lambda _: finished.append(time.perf_counter()))
+        return Speculation(future, started, finished, frozenset(tokenize(query)))
+
+    def start_turn(self, message: str):
+        with self._lock:
+            self._discard_unused()
+            self._turn_started = time.perf_counter()
+            self._turn_saved, self._turn_hits, self._turn_lookups = 0.0, 0, 0
+            for name, tool in self.tools.items():
+                self._speculations[name] = self._submit(tool, message)
+        self.stats.count('speculations', len(self.tools))
+
+    def _discard_unused(self):
+        if self._speculations:
+            self.stats.count('wasted', len(self._speculations))
+            self._speculations.clear()
+
+    def end_turn(self):
+        with self._lock:
+            self._discard_unused()
+            if self._turn_started is None:
+                return
+            seconds = time.perf_counter() - self._turn_started
+            self.stats.record_turn(seconds, self._turn_saved, self._turn_hits, self._turn_lookups)
+            logger.info("Customer support turn took %.2fs, speculation saved %.2fs (%d/%d lookups hit)",
+                        seconds, self._turn_saved, self._turn_hits, self._turn_lookups)
+            self._turn_started = None
+
+    def lookup(self, name: str, query: str):
+        with self._lock:
+            speculation = self._speculations.get(name)
+            if speculation is not None and query_match(query, speculation.terms) >= QUERY_MATCH_THRESHOLD:
+                del self._speculations[name]
+            else:
+                speculation = None
+            self._turn_lookups += 1
+        if speculation is None:
+            self.stats.count_lookup(name, hit=False)
+            return self.tools[name].func(query)
+
+        requested = time.perf_counter()
+        result = speculation.future.result()
+        # Only the part of the lookup that ran before the agent asked for it is saved
+        finished = speculation.finished[0] if speculation.finished else time.perf_counter()
+        with self._lock:
+            self._turn_saved += min(requested, finished) - speculation.started
+            self._turn_hits += 1
+        self.stats.count_lookup(name, hit=True)
+        return result
+
+    def wrap(self, tool: BaseTool) -> BaseTool:
+        """
+        The same tool as seen by the model, answered through lookup().
+        """
+        if tool.name not in self.tools:
+            return tool
+
+        def run(**kwargs):
+            (query,) = kwargs.values()
+            return self.lookup(tool.name, query)
+
+        return StructuredTool.from_function(func=run, name=tool.name, description=tool.description, args_schema=tool.args_schema)
@@ -0,0 +1,121 @@
+import bisect
+import datetime
+import threading
+from typing import Dict, List, Optional
+
+APPOINTMENT_DURATION = datetime.timedelta(minutes=30)
+BUSINESS_HOURS = (datetime.time(9, 0), datetime.time(17, 0))
+BUSINESS_DAYS = (0, 1, 2, 3, 4)  # Monday to Friday
+
+
+def round_up(moment: datetime.datetime, step: datetime.timedelta) -> datetime.datetime:
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    steps = -((midnight - moment) // step)
+    return midnight + steps * step
+
+
+class AppointmentCalendar:
+    """
+    Appointments kept sorted by start time.
+
+    Booked intervals never overlap, so ends are sorted too and a conflict check only
+    has to look at the neighbours either side of the bisect position: O(log n) for
+    booking, conflict checks and cancellation.
+    """
+    def __init__(self, duration: datetime.timedelta = APPOINTMENT_DURATION,
+                 business_hours=BUSINESS_HOURS, business_days=BUSINESS_DAYS):
+        self.duration = duration
+        self.opening, self.closing = business_hours
+        self.business_days = set(business_days)
+        self._lock = threading.Lock()
+        self._starts: List[datetime.datetime] = []
+        self._ends: List[datetime.datetime] = []
+        self._names: List[str] = []
+
+    def _conflict(self, start: datetime.datetime, end: datetime.datetime) -> Optional[int]:
+        """
+        Index of an appointment overlapping [start, end), or None.
+        """
+        i = bisect.bisect_right(self._starts, start)
+        if i > 0 and self._ends[i - 1] > start:
+            return i - 1
+        if i < len(self._starts) and self._starts[i] < end:
+            return i
+        return None
+
+    def is_free(self, start: datetime.datetime) -> bool:
+        with self._lock:
+            return self._conflict(start, start + self.duration) is None
+
+    def book(self, start: datetime.datetime, name: str) -> bool:
+        """
+        Returns:
+            bool: True if booked, False if it overlaps an existing appointment
+        """
+        end = start + self.duration
+        with self._lock:
+            if self._conflict(start, end) is not None:
+                return False
+            i = bisect.bisect_right(self._starts, start)
+            self._starts.insert(i, start)
+            self._ends.insert(i, end)
+            self._names.insert(i, name)
+            return True
+
+    def cancel(self, start: datetime.datetime) -> bool:
+        with self._lock:
+            i = bisect.bisect_left(self._starts, start)
+            if i == len(self._starts) or self._starts[i] != start:
+                return False
+            del self._starts[i], self._ends[i], self._names[i]
+            return True
+
+    def _next_opening(self, moment: datetime.datetime) -> datetime.datetime:
+        """
+        The earliest slot boundary at or after moment that fits in business hours.
+        """
+        moment = round_up(moment, self.duration)
+        while True:
+            opening = datetime.datetime.combine(moment.date(), self.opening)
+            closing = datetime.datetime.combine(moment.date(), self.closing)
+            if moment.weekday() in self.business_days and moment + self.duration <= closing:
+                return max(moment, opening)
+            moment = opening + datetime.timedelta(days=1)
+
+    def _conflicting_end(self, start: datetime.datetime, end: datetime.datetime) -> Optional[datetime.datetime]:
+        conflict = self._conflict(start, end)
+        return None if conflict is None else self._ends[conflict]
+
+    def _free_slots(self, after: datetime.datetime, count: int, conflicting_end) -> List[datetime.datetime]:
+        slots = []
+        candidate = self._next_opening(after)
+        while len(slots) < count:
+            blocked_until = conflicting_end(candidate, candidate + self.duration)
+            if blocked_until is None:
+                slots.append(candidate)
+                candidate = self._next_opening(candidate + self.duration)
+            else:
+                # Skip straight past the appointment in the way
+                candidate = self._next_opening(blocked_until)
+        return slots
+
+    def next_free_slots(self, after: datetime.datetime, count: int = 1) -> List[datetime.datetime]:
+        """
+        Args:
+            after (datetime.datetime): Earliest acceptable start time
+            count (int): Number of slots to return
+
+        Returns:
+            List[datetime.datetime]: Start times of the next free slots within business hours
+        """
+        with self._lock:
+            return self._free_slots(after, count, self._conflicting_end)
+
+    def appointments(self, start: datetime.datetime = None, end: datetime.datetime = None) -> List[Dict]:
+        with self._lock:
+            lo = 0 if start is None else bisect.bisect_left(self._starts, start)
+            hi = len(self._starts) if end is None else bisect.bisect_left(self._starts, end)
+            return [{'time': self._starts[i], 'name': self._names[i]} for i in range(lo, hi)]
+
+    def __len__(self) -> int:
+        return len(self._starts)
@@ -0,0 +1,104 @@
+import datetime
+from typing import Dict, List, Optional
+
+from src.langgraphagenticai.stores.appointment_calendar import APPOINTMENT_DURATION, BUSINESS_DAYS, BUSINESS_HOURS, AppointmentCalendar
+from src.langgraphagenticai.stores.sqlite_store import CONNECTION_POOL_SIZE, SQLiteConnectionPool
+
+
+APPOINTMENTS_DB_PATH = './.flowershop/appointments.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS appointments (
+    appointment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_appointments_start ON appointments (start);
+CREATE INDEX IF NOT EXISTS idx_appointments_day ON appointments (day, start);
+"""
+
+# Booked intervals never overlap, so (as in AppointmentCalendar) only the appointment
+# starting at or before the candidate and the one after it need checking. Both are
+# single probes of the start index.
+SELECT_PREVIOUS = "SELECT start, end FROM appointments WHERE start <= ? ORDER BY start DESC LIMIT 1"
+SELECT_NEXT = "SELECT start, end FROM appointments WHERE start > ? ORDER BY start LIMIT 1"
+INSERT_APPOINTMENT = "INSERT INTO appointments (day, start, end, name) VALUES (?, ?, ?, ?)"
+DELETE_APPOINTMENT = "DELETE FROM appointments WHERE start = ?"
+SELECT_APPOINTMENTS = "SELECT start, name FROM appointments WHERE start >= ? AND start < ? ORDER BY start"
+SELECT_DAY = "SELECT start, name FROM appointments WHERE day = ? ORDER BY start"
+COUNT_APPOINTMENTS = "SELECT COUNT(*) FROM appointments"
+
+
+def _key(moment: datetime.datetime) -> str:
+    # Fixed-width ISO text sorts in time order, so the start index serves range queries
+    return moment.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _parse(key: str) -> datetime.datetime:
+    return datetime.datetime.strptime(key, '%Y-%m-%dT%H:%M:%S')
+
+
+class SQLiteAppointmentStore(AppointmentCalendar):
+    """
+    AppointmentCalendar persisted in SQLite and shared by every worker process that
+    opens the same file. Rows carry their day so one day's diary is a single index range.
+
+    A booking checks for conflicts and inserts inside one BEGIN IMMEDIATE
+    transaction, so two processes can never book overlapping slots.
+    """
+    def __init__(self, path: str = APPOINTMENTS_DB_PATH, duration: datetime.timedelta = APPOINTMENT_DURATION,
+                 business_hours=BUSINESS_HOURS, business_days=BUSINESS_DAYS, pool_size: int = CONNECTION_POOL_SIZE):
+        super().__init__(duration, business_hours, business_days)
+        self.pool = SQLiteConnectionPool(path, pool_size)
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def _conflicting_end_in(self, connection, start: datetime.datetime, end: datetime.datetime) -> Optional[datetime.datetime]:
+        previous = connection.execute(SELECT_PREVIOUS, (_key(start),)).fetchone()
+        if previous is not None and previous['end'] > _key(start):
+            return _parse(previous['end'])
+        following = connection.execute(SELECT_NEXT, (_key(start),)).fetchone()
+        if following is not None and following['start'] < _key(end):
+            return _parse(following['end'])
+        return None
+
+    def is_free(self, start: datetime.datetime) -> bool:
+        with self.pool.connection() as connection:
+            return self._conflicting_end_in(connection, start, start + self.duration) is None
+
+    def book(self, start: datetime.datetime, name: str) -> bool:
+        end = start + self.duration
+        with self.pool.transaction() as connection:
+            if self._conflicting_end_in(connection, start, end) is not None:
+                return False
+            connection.execute(INSERT_APPOINTMENT, (start.date().isoformat(), _key(start), _key(end), name))
+            return True
+
+    def cancel(self, start: datetime.datetime) -> bool:
+        with self.pool.transaction() as connection:
+            return connection.execute(DELETE_APPOINTMENT, (_key(start),)).rowcount > 0
+
+    def next_free_slots(self, after: datetime.datetime, count: int = 1) -> List[datetime.datetime]:
+        with self.pool.connection() as connection:
+            return self._free_slots(after, count, lambda start, end: self._conflicting_end_in(connection, start, end))
+
+    def appointments(self, start: datetime.datetime = None, end: datetime.datetime = None) -> List[Dict]:
+        lower = _key(start) if start is not None else ''
+        upper = _key(end) if end is not None else '~'
+        with self.pool.connection() as connection:
+            rows = connection.execute(SELECT_APPOINTMENTS, (lower, upper)).fetchall()
+        return [{'time': _parse(row['start']), 'name': row['name']} for row in rows]
+
+    def appointments_on(self, day: datetime.date) -> List[Dict]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(SELECT_DAY, (day.isoformat(),)).fetchall()
+        return [{'time': _parse(row['start']), 'name': row['name']} for row in rows]
+
+    def __len__(self) -> int:
+        with self.pool.connection() as connection:
+            return connection.execute(COUNT_APPOINTMENTS).fetchone()[0]
+
+    def close(self):
+        self.pool.close()
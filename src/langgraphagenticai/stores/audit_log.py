@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List
+
+AUDIT_LOG_DIR = './.flowershop/audit'
+AUDIT_LOG_MAX_BYTES = 5 * 1024 * 1024
+AUDIT_LOG_BACKUPS = 5
+AUDIT_RECENT_ENTRIES = 500
+
+
+class AuditLog:
+    """
+    Append-only audit trail with bounded memory.
+
+    The most recent entries are kept in a ring buffer for the UI. Every entry is also
+    appended as a JSON line to a file that is rotated by size (name.log, name.log.1,
+    ...), so the disk footprint is capped as well. The file is only opened on the
+    first append.
+
+    A log reopened on files written earlier (after a restart) picks its count and
+    recent entries back up from them on first use.
+    """
+    def __init__(self, name: str, log_dir: str = AUDIT_LOG_DIR, max_bytes: int = AUDIT_LOG_MAX_BYTES,
+                 backups: int = AUDIT_LOG_BACKUPS, recent_entries: int = AUDIT_RECENT_ENTRIES):
+        self.path = os.path.join(log_dir, f'{name}.log')
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._total = 0
+        self._recent = deque(maxlen=recent_entries)
+        self._lock = threading.Lock()
+        self._handler = None
+        self._loaded = False
+
+    def _load(self):
+        # Oldest rotated file first, so the ring buffer ends with the newest entries
+        if self._loaded:
+            return
+        self._loaded = True
+        paths = [f'{self.path}.{index}' for index in range(self.backups, 0, -1)] + [self.path]
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            self._recent.append(json.loads(line))
+                        except ValueError:
+                            continue
+                        self._total += 1
+            except FileNotFoundError:
+                continue
+
+    @property
+    def total(self) -> int:
+        """
+        Entries still on disk, including rotated files, plus any appended since.
+        """
+        with self._lock:
+            self._load()
+            return self._total
+
+    def _file_handler(self) -> RotatingFileHandler:
+        # Used directly rather than through a named logger, so a log per tenant
+        # does not leave a logger behind in the logging registry
+        if self._handler is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding='utf-8')
+            self._handler.setFormatter(logging.Formatter('%(message)s'))
+        return self._handler
+
+    def append(self, entry: Dict) -> Dict:
+        entry = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), **entry}
+        with self._lock:
+            self._load()
+            self._recent.append(entry)
+            self._total += 1
+            self._file_handler().emit(logging.makeLogRecord({'msg': json.dumps(entry, ensure_ascii=False, default=str)}))
+        return entry
+
+    def recent(self, page: int = 1, page_size: int = 20) -> List[Dict]:
+        """
+        Args:
+            page (int): Page to return, starting at 1 for the newest entries
+            page_size (int): Entries per page
+
+        Returns:
+            List[Dict]: Up to page_size entries, newest first
+        """
+        with self._lock:
+            self._load()
+            entries = list(self._recent)
+        end = len(entries) - (max(page, 1) - 1) * page_size
+        return entries[max(end - page_size, 0):max(end, 0)][::-1]
+
+    def close(self):
+        with self._lock:
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._recent)
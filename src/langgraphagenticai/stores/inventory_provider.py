@@ -0,0 +1,152 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RELOAD_CHECK_INTERVAL = 2.0
+
+SOURCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory_source_files (
+    source_path TEXT PRIMARY KEY,
+    source_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inventory_source_items (
+    id TEXT PRIMARY KEY,
+    record_hash TEXT NOT NULL,
+    quantity INTEGER NOT NULL
+);
+"""
+
+SELECT_SOURCE_HASH = "SELECT source_hash FROM inventory_source_files WHERE source_path = ?"
+UPSERT_SOURCE_HASH = """
+INSERT INTO inventory_source_files (source_path, source_hash) VALUES (?, ?)
+ON CONFLICT (source_path) DO UPDATE SET source_hash = excluded.source_hash
+"""
+SELECT_SOURCE_ITEMS = "SELECT id, record_hash, quantity FROM inventory_source_items"
+UPSERT_SOURCE_ITEM = """
+INSERT INTO inventory_source_items (id, record_hash, quantity) VALUES (?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET record_hash = excluded.record_hash, quantity = excluded.quantity
+"""
+DELETE_SOURCE_ITEM = "DELETE FROM inventory_source_items WHERE id = ?"
+
+UPSERT_CATALOGUE_ITEM = """
+INSERT INTO inventory (id, name, quantity, price, type, description) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET name = excluded.name, price = excluded.price, type = excluded.type, description = excluded.description
+"""
+# A changed quantity in the file is applied as a restock delta, so stock sold since
+# the last load is not handed back
+ADJUST_STOCK = "UPDATE inventory SET quantity = MAX(0, quantity + ?) WHERE id = ?"
+DELETE_CATALOGUE_ITEM = "DELETE FROM inventory WHERE id = ?"
+
+
+def item_hash(item: Dict) -> str:
+    payload = json.dumps(item, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class InventoryProvider:
+    """
+    Keeps the inventory table in step with the inventory JSON file.
+
+    Nothing is read until the first sync, so importing the tools costs nothing. After
+    that, refresh_if_changed() is cheap enough to call on every tool use: it stats the
+    file at most once per check interval and, when the mtime or size moved, reloads on
+    a background thread. Readers keep seeing the last committed stock until the
+    reload commits.
+
+    The hash of the file and of every item last loaded from it are kept in the
+    database, so a reload only touches items that were added, edited or removed, and
+    several worker processes sharing the database apply each edit once.
+    """
+    def __init__(self, pool, path: str, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.pool = pool
+        self.path = path
+        self.check_interval = check_interval
+        self.last_summary: Optional[Dict[str, int]] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        with self.pool.connection() as connection:
+            connection.executescript(SOURCE_SCHEMA)
+
+    def _stat_signature(self) -> Tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Applies any difference between the file and the inventory table, blocking until done.
+
+        Returns:
+            Dict[str, int]: Number of added, updated, deleted and unchanged items
+        """
+        with self._reload_lock:
+            signature = self._stat_signature()
+            with open(self.path, 'rb') as f:
+                content = f.read()
+            source_hash = hashlib.sha256(content).hexdigest()
+
+            with self.pool.transaction() as connection:
+                row = connection.execute(SELECT_SOURCE_HASH, (self.path,)).fetchone()
+                known = {row['id']: (row['record_hash'], row['quantity']) for row in connection.execute(SELECT_SOURCE_ITEMS)}
+                if row is not None and row['source_hash'] == source_hash:
+                    summary = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': len(known)}
+                else:
+                    summary = self._apply(connection, json.loads(content), known)
+                    connection.execute(UPSERT_SOURCE_HASH, (self.path, source_hash))
+
+            self._signature = signature
+            self.last_summary = summary
+            if summary['added'] or summary['updated'] or summary['deleted']:
+                logger.info("Reloaded inventory from %s: %s", self.path, summary)
+            return summary
+
+    def _apply(self, connection, items, known: Dict[str, Tuple[str, int]]) -> Dict[str, int]:
+        summary = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        seen = set()
+        for item in items:
+            item_id = str(item['id'])
+            seen.add(item_id)
+            record_hash = item_hash(item)
+            previous = known.get(item_id)
+            if previous is not None and previous[0] == record_hash:
+                summary['unchanged'] += 1
+                continue
+            connection.execute(UPSERT_CATALOGUE_ITEM, (item_id, item['name'], item['quantity'], item.get('price'), item.get('type'), item.get('description')))
+            if previous is not None and item['quantity'] != previous[1]:
+                connection.execute(ADJUST_STOCK, (item['quantity'] - previous[1], item_id))
+            connection.execute(UPSERT_SOURCE_ITEM, (item_id, record_hash, item['quantity']))
+            summary['updated' if previous is not None else 'added'] += 1
+        for item_id in known.keys() - seen:
+            connection.execute(DELETE_CATALOGUE_ITEM, (item_id,))
+            connection.execute(DELETE_SOURCE_ITEM, (item_id,))
+            summary['deleted'] += 1
+        return summary
+
+    def _reload(self):
+        try:
+            self.sync()
+        except Exception:
+            # Keep serving the last good inventory; the next check will try again
+            logger.exception("Reloading inventory from %s failed", self.path)
+
+    def refresh_if_changed(self):
+        """
+        Starts a background reload if the file changed since the last sync. Never waits
+        for a reload that is already running.
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval or self._reload_lock.locked():
+            return
+        self._last_check = now
+        try:
+            signature = self._stat_signature()
+        except OSError:
+            return
+        if signature != self._signature:
+            threading.Thread(target=self._reload, name='inventory-reload', daemon=True).start()
@@ -0,0 +1,397 @@
+import json
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.langgraphagenticai.stores.inventory_provider import InventoryProvider
+
+
+FLOWER_SHOP_DB_PATH = './.flowershop/flowershop.sqlite3'
+CONNECTION_POOL_SIZE = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    postcode TEXT NOT NULL,
+    dob TEXT NOT NULL,
+    first_line_address TEXT,
+    phone_number TEXT,
+    email TEXT,
+    dpa_name TEXT NOT NULL,
+    dpa_postcode TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_customers_dpa ON customers (dpa_name, dpa_postcode, dob);
+-- AUTOINCREMENT never hands out a number twice, even after rows are deleted
+CREATE TABLE IF NOT EXISTS customer_ids (seq INTEGER PRIMARY KEY AUTOINCREMENT);
+
+CREATE TABLE IF NOT EXISTS inventory (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    quantity INTEGER NOT NULL CHECK (quantity >= 0),
+    price REAL,
+    type TEXT,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    order_seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL UNIQUE,
+    customer_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    items TEXT NOT NULL,
+    quantity TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders (customer_id, order_seq);
+CREATE INDEX IF NOT EXISTS idx_orders_customer_status ON orders (customer_id, status COLLATE NOCASE, order_seq);
+"""
+
+# Statements are kept as constants so each pooled connection compiles them once and
+# then reuses them from sqlite3's per-connection statement cache.
+INSERT_CUSTOMER = """
+INSERT INTO customers (customer_id, name, postcode, dob, first_line_address, phone_number, email, dpa_name, dpa_postcode)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Seeding is repeated on every start, so rows that are already there are skipped
+INSERT_SEED_CUSTOMER = INSERT_CUSTOMER.replace("INSERT", "INSERT OR IGNORE", 1)
+NEXT_CUSTOMER_SEQ = "INSERT INTO customer_ids (seq) VALUES (NULL)"
+DELETE_CUSTOMER_SEQ = "DELETE FROM customer_ids WHERE seq = ?"
+CUSTOMER_ID_TAKEN = "SELECT 1 FROM customers WHERE customer_id = ?"
+SELECT_CUSTOMER_COLUMNS = "SELECT name, postcode, dob, customer_id, first_line_address, phone_number, email FROM customers"
+SELECT_CUSTOMER_BY_DPA = SELECT_CUSTOMER_COLUMNS + " WHERE dpa_name = ? AND dpa_postcode = ? AND dob = ? ORDER BY rowid LIMIT 1"
+SELECT_CUSTOMER_BY_ID = SELECT_CUSTOMER_COLUMNS + " WHERE customer_id = ?"
+COUNT_CUSTOMERS = "SELECT COUNT(*) FROM customers"
+
+UPSERT_INVENTORY_ITEM = """
+INSERT INTO inventory (id, name, quantity, price, type, description) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO NOTHING
+"""
+SELECT_INVENTORY_COLUMNS = "SELECT id, name, quantity, price, type, description FROM inventory"
+SELECT_INVENTORY_ITEM = SELECT_INVENTORY_COLUMNS + " WHERE id = ?"
+DECREMENT_STOCK = "UPDATE inventory SET quantity = quantity - ? WHERE id = ? AND quantity >= ?"
+INCREMENT_STOCK = "UPDATE inventory SET quantity = quantity + ? WHERE id = ?"
+
+INSERT_ORDER = "INSERT INTO orders (order_id, customer_id, status, items, quantity) VALUES (?, ?, ?, ?, ?)"
+INSERT_NEXT_ORDER = """
+INSERT INTO orders (order_id, customer_id, status, items, quantity)
+VALUES ('ORD' || printf('%03d', COALESCE((SELECT MAX(order_seq) FROM orders), 0) + 1), ?, ?, ?, ?)
+"""
+SELECT_ORDER_COLUMNS = "SELECT order_id, customer_id, status, items, quantity FROM orders"
+SELECT_ORDER_BY_SEQ = SELECT_ORDER_COLUMNS + " WHERE order_seq = ?"
+# Both filters are served by a customer_id-prefixed index, so the cost depends on one
+# customer's history rather than on the total number of orders
+SELECT_ORDERS_FOR_CUSTOMER = SELECT_ORDER_COLUMNS + " WHERE customer_id = ? ORDER BY order_seq LIMIT ? OFFSET ?"
+SELECT_ORDERS_FOR_CUSTOMER_BY_STATUS = SELECT_ORDER_COLUMNS + " WHERE customer_id = ? AND status = ? COLLATE NOCASE ORDER BY order_seq LIMIT ? OFFSET ?"
+COUNT_ORDERS_FOR_CUSTOMER = "SELECT COUNT(*) FROM orders WHERE customer_id = ?"
+COUNT_ORDERS_FOR_CUSTOMER_BY_STATUS = "SELECT COUNT(*) FROM orders WHERE customer_id = ? AND status = ? COLLATE NOCASE"
+
+
+class SQLiteConnectionPool:
+    """
+    Small fixed-size pool of SQLite connections in WAL mode.
+
+    WAL lets readers run alongside a writer, and a busy timeout makes writers from
+    other Streamlit worker processes queue up instead of failing.
+    """
+    def __init__(self, path: str, size: int = CONNECTION_POOL_SIZE):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self.closed = False
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None leaves transactions to explicit BEGIN statements
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False, cached_statements=128)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _checkout(self) -> Tuple[sqlite3.Connection, bool]:
+        while not self.closed:
+            try:
+                return self._pool.get(timeout=1.0), True
+            except queue.Empty:
+                continue
+        # Someone still holding a closed pool (an evicted tenant) gets a one-off connection
+        return self._connect(), False
+
+    @contextmanager
+    def connection(self):
+        connection, pooled = self._checkout()
+        try:
+            yield connection
+        finally:
+            if pooled and not self.closed:
+                self._pool.put(connection)
+            else:
+                connection.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        BEGIN IMMEDIATE takes the write lock up front, so a read-check-write sequence
+        cannot interleave with another writer.
+        """
+        with self.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self):
+        """
+        Closes the idle connections now and the ones in use as they are returned.
+        """
+        self.closed = True
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def dpa_key(name: str, postcode: str, year_of_birth: int, month_of_birth: int, day_of_birth: int) -> Tuple[str, str, str]:
+    """
+    Normalised (name, postcode, dob) used to match a data protection check.
+    Case and spacing are ignored, so "sw1a1aa" matches "SW1A 1AA".
+    """
+    return (
+        " ".join(name.lower().split()),
+        "".join(postcode.upper().split()),
+        f"{int(year_of_birth):04}-{int(month_of_birth):02}-{int(day_of_birth):02}",
+    )
+
+
+def customer_dpa_key(customer: Dict) -> Tuple[str, str, str]:
+    year, month, day = customer['dob'].split('-')
+    return dpa_key(customer['name'], customer['postcode'], int(year), int(month), int(day))
+
+
+def _customer_row(customer: Dict) -> Tuple:
+    dpa_name, dpa_postcode, dob = customer_dpa_key(customer)
+    return (
+        customer['customer_id'], customer['name'], customer['postcode'], dob,
+        customer.get('first_line_address'), customer.get('phone_number'), customer.get('email'),
+        dpa_name, dpa_postcode,
+    )
+
+
+def _order(row: sqlite3.Row) -> Dict:
+    order = dict(row)
+    order['items'] = json.loads(order['items'])
+    order['quantity'] = json.loads(order['quantity'])
+    return order
+
+
+class SQLiteCustomerStore:
+    """
+    Customer records in the customers table; data protection checks are served by
+    its (dpa_name, dpa_postcode, dob) index.
+    """
+    def __init__(self, pool: SQLiteConnectionPool):
+        self.pool = pool
+
+    def add(self, customer: Dict) -> Dict:
+        """
+        Raises sqlite3.IntegrityError if the customer_id is already taken.
+        """
+        with self.pool.transaction() as connection:
+            connection.execute(INSERT_CUSTOMER, _customer_row(customer))
+        return customer
+
+    def add_many(self, customers: Iterable[Dict]):
+        with self.pool.transaction() as connection:
+            connection.executemany(INSERT_SEED_CUSTOMER, (_customer_row(customer) for customer in customers))
+
+    def _next_customer_id(self, connection: sqlite3.Connection) -> str:
+        # Numbers already used by seeded or imported customers are skipped
+        while True:
+            seq = connection.execute(NEXT_CUSTOMER_SEQ).lastrowid
+            connection.execute(DELETE_CUSTOMER_SEQ, (seq,))
+            customer_id = f'CUST{seq:03}'
+            if connection.execute(CUSTOMER_ID_TAKEN, (customer_id,)).fetchone() is None:
+                return customer_id
+
+    def create(self, name: str, dob: str, postcode: str, first_line_address: str, phone_number: str, email: str) -> Dict:
+        with self.pool.transaction() as connection:
+            customer = {
+                'name': name,
+                'dob': dob,
+                'postcode': postcode,
+                'first_line_address': first_line_address,
+                'phone_number': phone_number,
+                'email': email,
+                'customer_id': self._next_customer_id(connection),
+            }
+            connection.execute(INSERT_CUSTOMER, _customer_row(customer))
+        return customer
+
+    def find_by_dpa(self, name: str, postcode: str, year_of_birth: int, month_of_birth: int, day_of_birth: int) -> Optional[Dict]:
+        with self.pool.connection() as connection:
+            row = connection.execute(SELECT_CUSTOMER_BY_DPA, dpa_key(name, postcode, year_of_birth, month_of_birth, day_of_birth)).fetchone()
+        return dict(row) if row else None
+
+    def get(self, customer_id: str) -> Optional[Dict]:
+        with self.pool.connection() as connection:
+            row = connection.execute(SELECT_CUSTOMER_BY_ID, (customer_id,)).fetchone()
+        return dict(row) if row else None
+
+    def all(self) -> List[Dict]:
+        with self.pool.connection() as connection:
+            return [dict(row) for row in connection.execute(SELECT_CUSTOMER_COLUMNS + " ORDER BY rowid")]
+
+    def __len__(self) -> int:
+        with self.pool.connection() as connection:
+            return connection.execute(COUNT_CUSTOMERS).fetchone()[0]
+
+
+class SQLiteInventoryStore:
+    """
+    Stock levels in the inventory table. Reservations run in one IMMEDIATE
+    transaction with a guarded decrement, so stock cannot go negative even across
+    processes.
+    """
+    def __init__(self, pool: SQLiteConnectionPool):
+        self.pool = pool
+
+    def bulk_load(self, items: Iterable[Dict]):
+        """
+        Adds catalogue items that are not in the table yet; existing stock levels are kept.
+        """
+        rows = [(item['id'], item['name'], item['quantity'], item.get('price'), item.get('type'), item.get('description')) for item in items]
+        with self.pool.transaction() as connection:
+            connection.executemany(UPSERT_INVENTORY_ITEM, rows)
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        with self.pool.connection() as connection:
+            row = connection.execute(SELECT_INVENTORY_ITEM, (item_id,)).fetchone()
+        return dict(row) if row else None
+
+    def items(self) -> List[Dict]:
+        with self.pool.connection() as connection:
+            return [dict(row) for row in connection.execute(SELECT_INVENTORY_COLUMNS + " ORDER BY id")]
+
+    def _reserve(self, connection: sqlite3.Connection, items: Dict[str, int]) -> List[str]:
+        problems = []
+        stock = {}
+        for item_id, quantity in items.items():
+            row = connection.execute(SELECT_INVENTORY_ITEM, (item_id,)).fetchone()
+            if row is None:
+                problems.append(f'Item with id {item_id} is not found in the inventory')
+            elif not isinstance(quantity, int) or quantity <= 0:
+                problems.append(f'Quantity for item {item_id} must be a positive whole number, got {quantity}')
+            else:
+                stock[item_id] = row
+        for item_id, row in stock.items():
+            if items[item_id] > row['quantity']:
+                problems.append(f'There is insufficient quantity in the inventory for this item {row["name"]}\nAvailable: {row["quantity"]}\nRequested: {items[item_id]}')
+        if problems:
+            return problems
+        for item_id in sorted(items):
+            connection.execute(DECREMENT_STOCK, (items[item_id], item_id, items[item_id]))
+        return []
+
+    def reserve(self, items: Dict[str, int]) -> List[str]:
+        with self.pool.transaction() as connection:
+            return self._reserve(connection, items)
+
+    def release(self, items: Dict[str, int]):
+        with self.pool.transaction() as connection:
+            connection.executemany(INCREMENT_STOCK, [(quantity, item_id) for item_id, quantity in items.items()])
+
+
+class SQLiteOrderStore:
+    def __init__(self, pool: SQLiteConnectionPool):
+        self.pool = pool
+
+    def add_many(self, orders: Iterable[Dict]):
+        rows = [(order['order_id'], order['customer_id'], order['status'], json.dumps(order['items']), json.dumps(order['quantity'])) for order in orders]
+        with self.pool.transaction() as connection:
+            connection.executemany(INSERT_ORDER.replace("INSERT", "INSERT OR IGNORE", 1), rows)
+
+    def _create(self, connection: sqlite3.Connection, customer_id: str, items: Dict[str, int], status: str) -> Dict:
+        cursor = connection.execute(INSERT_NEXT_ORDER, (customer_id, status, json.dumps(list(items.keys())), json.dumps(list(items.values()))))
+        return _order(connection.execute(SELECT_ORDER_BY_SEQ, (cursor.lastrowid,)).fetchone())
+
+    def for_customer(self, customer_id: str, status: Optional[str] = None, limit: int = -1, offset: int = 0) -> List[Dict]:
+        """
+        Args:
+            customer_id (str): Customer whose orders to return, oldest first
+            status (Optional[str]): Only return orders with this status (case-insensitive)
+            limit (int): Maximum number of orders; -1 for no limit
+            offset (int): Number of matching orders to skip
+
+        Returns:
+            List[Dict]: The matching orders
+        """
+        with self.pool.connection() as connection:
+            if status is None:
+                rows = connection.execute(SELECT_ORDERS_FOR_CUSTOMER, (customer_id, limit, offset))
+            else:
+                rows = connection.execute(SELECT_ORDERS_FOR_CUSTOMER_BY_STATUS, (customer_id, status, limit, offset))
+            return [_order(row) for row in rows]
+
+    def count_for_customer(self, customer_id: str, status: Optional[str] = None) -> int:
+        with self.pool.connection() as connection:
+            if status is None:
+                return connection.execute(COUNT_ORDERS_FOR_CUSTOMER, (customer_id,)).fetchone()[0]
+            return connection.execute(COUNT_ORDERS_FOR_CUSTOMER_BY_STATUS, (customer_id, status)).fetchone()[0]
+
+
+class FlowerShopDatabase:
+    """
+    Persistent storage behind the customer support tools: customers, inventory and
+    orders in one SQLite file shared by every session and worker process.
+    """
+    def __init__(self, path: str = FLOWER_SHOP_DB_PATH, pool_size: int = CONNECTION_POOL_SIZE):
+        self.pool = SQLiteConnectionPool(path, pool_size)
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+        self.customers = SQLiteCustomerStore(self.pool)
+        self.inventory = SQLiteInventoryStore(self.pool)
+        self.orders = SQLiteOrderStore(self.pool)
+        self.inventory_provider: Optional[InventoryProvider] = None
+
+    def watch_inventory(self, inventory_file_path: str) -> Dict[str, int]:
+        """
+        Loads the inventory file now and keeps the table in step with later edits to it.
+        """
+        self.inventory_provider = InventoryProvider(self.pool, inventory_file_path)
+        return self.inventory_provider.sync()
+
+    def place_order(self, customer_id: str, items: Dict[str, int], status: str = 'Waiting for payment') -> Tuple[Optional[Dict], List[str]]:
+        """
+        Reserves stock and records the order in a single transaction, so either
+        both happen or neither does.
+
+        Returns:
+            Tuple[Optional[Dict], List[str]]: The new order, or None and the reasons it was refused
+        """
+        with self.pool.transaction() as connection:
+            problems = self.inventory._reserve(connection, items)
+            if problems:
+                return None, problems
+            return self.orders._create(connection, customer_id, items, status), []
+
+    def close(self):
+        self.pool.close()
+
+
+def open_flower_shop_database(path: str = FLOWER_SHOP_DB_PATH, seed_customers: Iterable[Dict] = (), seed_orders: Iterable[Dict] = (),
+                              inventory_file_path: str = None, pool_size: int = CONNECTION_POOL_SIZE) -> FlowerShopDatabase:
+    """
+    Opens the database at path, inserting any seed rows that are missing and loading
+    the inventory file if one is given.
+    """
+    database = FlowerShopDatabase(path, pool_size)
+    database.customers.add_many(seed_customers)
+    database.orders.add_many(seed_orders)
+    if inventory_file_path:
+        database.watch_inventory(inventory_file_path)
+    return database
@@ -0,0 +1,211 @@
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from src.langgraphagenticai.stores.appointment_store import SQLiteAppointmentStore
+from src.langgraphagenticai.stores.audit_log import AuditLog
+from src.langgraphagenticai.stores.sqlite_store import CONNECTION_POOL_SIZE, FlowerShopDatabase, open_flower_shop_database
+
+DEFAULT_TENANT = 'default'
+DEFAULT_TENANT_DIR = './.flowershop'
+TENANT_ROOT = './.flowershop/tenants'
+TENANT_SHARDS = 16
+TENANTS_PER_SHARD = 8
+TENANT_POOL_SIZE = 2
+# Session directories untouched for this long are deleted; shop records are never swept
+TENANT_IDLE_SECONDS = 7 * 24 * 3600
+CLEANUP_INTERVAL_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def tenant_id_from_config(config: Optional[Dict]) -> str:
+    """
+    The tenant a graph run belongs to: an explicit tenant_id, else the thread_id or
+    session_id in the run's configurable, else the shared default tenant.
+    """
+    configurable = (config or {}).get('configurable') or {}
+    for key in ('tenant_id', 'thread_id', 'session_id'):
+        if configurable.get(key):
+            return str(configurable[key])
+    return DEFAULT_TENANT
+
+
+def tenant_key(tenant_id: str) -> str:
+    return hashlib.sha1(tenant_id.encode('utf-8')).hexdigest()[:20]
+
+
+class TenantState:
+    """
+    The state the tools resolve for one tenant. Shop-wide records (customers and
+    orders, stock, the appointment diary and the data protection audit log) belong
+    to the default tenant: every other tenant is given it as its shop and reads and
+    writes those records through it, so a customer registered in one session can be
+    found from another and two sessions cannot book the same slot or buy the last
+    unit. The tenant's own directory is only for state that belongs to one session.
+    Databases are opened on first use.
+    """
+    def __init__(self, tenant_id: str, directory: str, pool_size: int = TENANT_POOL_SIZE, shop: Optional['TenantState'] = None):
+        self.tenant_id = tenant_id
+        self.directory = directory
+        self.pool_size = pool_size
+        self.shop = shop
+        self._data_protection_checks = None if shop else AuditLog('data_protection_checks', log_dir=os.path.join(directory, 'audit'))
+        self._lock = threading.Lock()
+        self._database: Optional[FlowerShopDatabase] = None
+        self._appointments: Optional[SQLiteAppointmentStore] = None
+
+    @property
+    def data_protection_checks(self) -> AuditLog:
+        return self.shop.data_protection_checks if self.shop else self._data_protection_checks
+
+    def database(self, seed_customers: Iterable[Dict] = (), seed_orders: Iterable[Dict] = (),
+                 inventory_file_path: str = None) -> FlowerShopDatabase:
+        if self.shop:
+            return self.shop.database(seed_customers, seed_orders, inventory_file_path)
+        if self._database is None:
+            with self._lock:
+                if self._database is None:
+                    self._database = open_flower_shop_database(
+                        os.path.join(self.directory, 'flowershop.sqlite3'),
+                        seed_customers, seed_orders, inventory_file_path, self.pool_size,
+                    )
+        # Picks up edits to the inventory file
+        if self._database.inventory_provider is not None:
+            self._database.inventory_provider.refresh_if_changed()
+        return self._database
+
+    def appointments(self) -> SQLiteAppointmentStore:
+        if self.shop:
+            return self.shop.appointments()
+        if self._appointments is None:
+            with self._lock:
+                if self._appointments is None:
+                    self._appointments = SQLiteAppointmentStore(os.path.join(self.directory, 'appointments.sqlite3'), pool_size=self.pool_size)
+        return self._appointments
+
+    def close(self):
+        """
+        Closes what the tenant opened itself; the shop it shares stays open. Anyone
+        still holding the state keeps working on one-off connections.
+        """
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+            if self._appointments is not None:
+                self._appointments.close()
+        if self._data_protection_checks is not None:
+            self._data_protection_checks.close()
+
+
+def last_modified(directory: str) -> float:
+    latest = os.path.getmtime(directory)
+    for parent, _, files in os.walk(directory):
+        for name in files:
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(parent, name)))
+            except OSError:
+                continue
+    return latest
+
+
+class TenantRegistry:
+    """
+    Process-wide map of tenant id to TenantState, split into shards with a lock each
+    so resolving one session's state never blocks on another's. Each shard keeps its
+    most recently used tenants open and closes the rest; their data stays on disk
+    and is reopened on the next request.
+
+    On disk tenants are spread over the same number of shard directories, keyed by
+    a hash of the tenant id. These hold per-session state only, so directories of
+    tenants that are not open and have not been written for idle_seconds are
+    deleted by a sweep that runs at most once per cleanup interval. Customers,
+    orders, appointments and the audit log live in the default tenant's directory,
+    which the sweep never touches.
+    """
+    def __init__(self, root: str = TENANT_ROOT, shards: int = TENANT_SHARDS, tenants_per_shard: int = TENANTS_PER_SHARD,
+                 default_directory: str = DEFAULT_TENANT_DIR, idle_seconds: float = TENANT_IDLE_SECONDS,
+                 cleanup_interval: float = CLEANUP_INTERVAL_SECONDS):
+        self.root = root
+        self.tenants_per_shard = tenants_per_shard
+        self.idle_seconds = idle_seconds
+        self.cleanup_interval = cleanup_interval
+        self._next_cleanup = time.monotonic() + cleanup_interval
+        self._cleanup_lock = threading.Lock()
+        self.default = TenantState(DEFAULT_TENANT, default_directory, pool_size=CONNECTION_POOL_SIZE)
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def get(self, tenant_id: str) -> TenantState:
+        if time.monotonic() >= self._next_cleanup and not self._cleanup_lock.locked():
+            threading.Thread(target=self.remove_idle_tenants, name='tenant-cleanup', daemon=True).start()
+        if tenant_id == DEFAULT_TENANT:
+            return self.default
+        key = tenant_key(tenant_id)
+        shard = int(key[:8], 16) % len(self._shards)
+        tenants = self._shards[shard]
+        evicted = []
+        with self._locks[shard]:
+            state = tenants.get(key)
+            if state is None:
+                state = TenantState(tenant_id, os.path.join(self.root, f'{shard:02}', key), shop=self.default)
+                tenants[key] = state
+                while len(tenants) > self.tenants_per_shard:
+                    evicted.append(tenants.popitem(last=False)[1])
+            else:
+                tenants.move_to_end(key)
+        for old_state in evicted:
+            old_state.close()
+        return state
+
+    def remove_idle_tenants(self) -> int:
+        """
+        Deletes the session directories under root of tenants that are not open and
+        have not been written for idle_seconds. The shop's records are kept.
+
+        Returns:
+            int: Number of tenant directories removed
+        """
+        if not self._cleanup_lock.acquire(blocking=False):
+            return 0
+        removed = 0
+        try:
+            self._next_cleanup = time.monotonic() + self.cleanup_interval
+            cutoff = time.time() - self.idle_seconds
+            for shard, tenants in enumerate(self._shards):
+                shard_directory = os.path.join(self.root, f'{shard:02}')
+                if not os.path.isdir(shard_directory):
+                    continue
+                for key in os.listdir(shard_directory):
+                    directory = os.path.join(shard_directory, key)
+                    # Held while deleting, so the tenant cannot be reopened half-removed
+                    with self._locks[shard]:
+                        if key in tenants or last_modified(directory) > cutoff:
+                            continue
+                        shutil.rmtree(directory, ignore_errors=True)
+                        removed += 1
+        except OSError:
+            logger.exception("Removing idle tenant directories under %s failed", self.root)
+        finally:
+            self._cleanup_lock.release()
+        if removed:
+            logger.info("Removed %d idle tenant directories under %s", removed, self.root)
+        return removed
+
+    def open_tenants(self) -> int:
+        return sum(len(tenants) for tenants in self._shards)
+
+
+tenant_registry = TenantRegistry()
+
+
+def get_tenant_state(config: Optional[Dict] = None) -> TenantState:
+    """
+    Resolves the state for a graph run from its config (thread/session id).
+    """
+    return tenant_registry.get(tenant_id_from_config(config))
@@ -1,30 +1,36 @@
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from typing import List, Dict
-import json
+from typing import List, Dict, Optional
 
-from src.langgraphagenticai.vectorstores.vectore_store import FlowerShopVectorStore
+from src.langgraphagenticai.stores.sqlite_store import FlowerShopDatabase
+from src.langgraphagenticai.stores.tenant_state import get_tenant_state
+from src.langgraphagenticai.vectorstores.store_registry import get_faq_retriever, get_flower_shop_vector_store
 
 
 
 INVENTORY_FILE_PATH = './data/inventory.json'
+ORDERS_PAGE_SIZE = 20
 
-customers_database = [
+SEED_CUSTOMERS = [
     {"name": "John Doe", "postcode": "SW1A 1AA", "dob": "1990-01-01", "customer_id": "CUST001", "first_line_address": "123 Main St", "phone_number": "07712345678", "email": "john.doe@example.com"},
     {"name": "Jane Smith", "postcode": "E1 6AN", "dob": "1985-05-15", "customer_id": "CUST002", "first_line_address": "456 High St", "phone_number": "07723456789", "email": "jane.smith@example.com"},
 ]
 
-orders_database = [
+SEED_ORDERS = [
     {"order_id": "ORD001", "customer_id": "CUST001", "status": "Processing", "items": ["Red Roses Bouquet"], "quantity": [1]},
     {"order_id": "ORD002", "customer_id": "CUST002", "status": "Shipped", "items": ["Mixed Tulips", "Vase"], "quantity": [3, 1]},
 ]
 
-with open(INVENTORY_FILE_PATH, 'r') as f:
-    inventory_database = json.load(f)
 
-data_protection_checks = []
+def get_database(config: RunnableConfig = None) -> FlowerShopDatabase:
+    """
+    The shop database, shared by every session, opened (and seeded) on first use.
+    """
+    return get_tenant_state(config).database(SEED_CUSTOMERS, SEED_ORDERS, INVENTORY_FILE_PATH)
+
 
 @tool
-def data_protection_check(name: str, postcode: str, year_of_birth: int, month_of_birth: int, day_of_birth: int) -> Dict:
+def data_protection_check(name: str, postcode: str, year_of_birth: int, month_of_birth: int, day_of_birth: int, config: RunnableConfig) -> Dict:
     """
     Perform a data protection check against a customer to retrieve customer details.
 
@@ -38,27 +44,25 @@ def data_protection_check(name: str, postcode: str, year_of_birth: int, month_of
     Returns:
         Dict: Customer details (name, postcode, dob, customer_id, first_line_address, email)
     """
-    data_protection_checks.append(
+    customer = get_database(config).customers.find_by_dpa(name, postcode, year_of_birth, month_of_birth, day_of_birth)
+    get_tenant_state(config).data_protection_checks.append(
         {
             'name': name,
             'postcode': postcode,
             'year_of_birth': year_of_birth,
             'month_of_birth': month_of_birth,
-            'day_of_birth': day_of_birth
+            'day_of_birth': day_of_birth,
+            'passed': customer is not None,
+            'customer_id': customer['customer_id'] if customer is not None else None,
         }
     )
-    for customer in customers_database:
-        if (customer['name'].lower() == name.lower() and
-            customer['postcode'].lower() == postcode.lower() and
-            int(customer['dob'][0:4]) == year_of_birth and
-            int(customer["dob"][5:7]) == month_of_birth and
-            int(customer["dob"][8:10]) == day_of_birth):
-            return f"DPA check passed - Retrieved customer details:\n{customer}"
+    if customer is not None:
+        return f"DPA check passed - Retrieved customer details:\n{customer}"
 
     return "DPA check failed, no customer with these details found"
 
 @tool
-def create_new_customer(first_name: str, surname: str, year_of_birth: int, month_of_birth: int, day_of_birth: int, postcode: str, first_line_of_address: str, phone_number: str, email: str) -> str:
+def create_new_customer(first_name: str, surname: str, year_of_birth: int, month_of_birth: int, day_of_birth: int, postcode: str, first_line_of_address: str, phone_number: str, email: str, config: RunnableConfig) -> str:
     """
     Creates a customer profile, so that they can place orders.
 
@@ -78,17 +82,15 @@ def create_new_customer(first_name: str, surname: str, year_of_birth: int, month
     """
     if len(phone_number) != 11:
         return "Phone number must be 11 digits"
-    customer_id = len(customers_database) + 1
-    customers_database.append({
-        'name': first_name + ' ' + surname,
-        'dob': f'{year_of_birth}-{month_of_birth:02}-{day_of_birth:02}',
-        'postcode': postcode,
-        'first_line_address': first_line_of_address,
-        'phone_number': phone_number,
-        'email': email,
-        'customer_id': f'CUST{customer_id}'
-    })
-    return f"Customer registered, with customer_id {f'CUST{customer_id}'}"
+    customer = get_database(config).customers.create(
+        name=first_name + ' ' + surname,
+        dob=f'{year_of_birth}-{month_of_birth:02}-{day_of_birth:02}',
+        postcode=postcode,
+        first_line_address=first_line_of_address,
+        phone_number=phone_number,
+        email=email,
+    )
+    return f"Customer registered, with customer_id {customer['customer_id']}"
     
 
 @tool
@@ -102,7 +104,7 @@ def query_knowledge_base(query: str) -> List[Dict[str, str]]:
     Return:
         List[Dict[str, str]]: Potentially relevant question and answer pairs from the knowledge base
     """
-    return FlowerShopVectorStore().vector_store.query_faqs(query=query)
+    return get_faq_retriever().query(query)
 
 
 
@@ -121,26 +123,38 @@ def search_for_product_reccommendations(description: str):
     Return:
         List[Dict[str, str]]: Potentially relevant products
     """
-    return FlowerShopVectorStore().vector_store.query_inventories(query=description)
+    return get_flower_shop_vector_store().query_inventories(query=description)
 
 @tool
-def retrieve_existing_customer_orders(customer_id: str) -> List[Dict]:
+def retrieve_existing_customer_orders(customer_id: str, config: RunnableConfig, status: Optional[str] = None, page: int = 1, page_size: int = ORDERS_PAGE_SIZE) -> Dict:
     """
     Retrieves the orders associated with the customer, including their status, items and ids
 
     Args:
         customer_id (str): Customer unique id associated with the order
+        status (Optional[str]): Only return orders with this status, e.g. "Processing", "Shipped" or "Waiting for payment"
+        page (int): Page of results to return, starting at 1
+        page_size (int): Number of orders per page
 
     Returns:
-        List[Dict]: All the orders associated with the customer_id passed in
+        Dict: One page of the customer's orders, with the total number of matching orders
     """
-    customer_orders = [order for order in orders_database if order['customer_id'] == customer_id]
-    if not customer_orders:
-        return f"No orders associated with this customer id: {customer_id}"
-    return customer_orders
+    orders = get_database(config).orders
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), ORDERS_PAGE_SIZE)
+    total = orders.count_for_customer(customer_id, status)
+    if not total:
+        filter_text = f" and status: {status}" if status else ""
+        return f"No orders associated with this customer id: {customer_id}{filter_text}"
+    return {
+        'orders': orders.for_customer(customer_id, status, limit=page_size, offset=(page - 1) * page_size),
+        'page': page,
+        'page_size': page_size,
+        'total_orders': total,
+    }
 
 @tool
-def place_order(items: Dict[str, int], customer_id: str) -> str:
+def place_order(items: Dict[str, int], customer_id: str, config: RunnableConfig) -> str:
     """
     Places an order for the requested items, and for the required quantities.
 
@@ -151,35 +165,8 @@ def place_order(items: Dict[str, int], customer_id: str) -> str:
     Returns:
         str: Message indicating that the order has been placed, or, it hasnt been placed due to an issue 
     """
-    # Check that the item ids are valid 
-    # Check that the quantities of items are valid
-    availability_messages = []
-    valid_item_ids = [
-        item['id'] for item in inventory_database
-    ]
-    for item_id, quantity in items.items():
-        if item_id not in valid_item_ids:
-            availability_messages.append(f'Item with id {item_id} is not found in the inventory')
-        else:
-            inventory_item = [item for item in inventory_database if item['id'] == item_id][0]
-            if quantity > inventory_item['quantity']:
-                availability_messages.append(f'There is insufficient quantity in the inventory for this item {inventory_item["name"]}\nAvailable: {inventory_item["quantity"]}\nRequested: {quantity}')
+    # Check the item ids and quantities, reserve the stock and record the order in one transaction
+    order, availability_messages = get_database(config).place_order(customer_id, items)
     if availability_messages:
         return "Order cannot be placed due to the following issues: \n" + '\n'.join(availability_messages)
-
-    # Place the order (in pretend database)
-    order_id = len(orders_database) + 1
-    orders_database.append(
-        {
-            'order_id': order_id,
-            'customer_id': customer_id,
-            'status': 'Waiting for payment',
-            'items': list(items.keys()),
-            'quantity': list(items.values())
-        }
-    )
-    # Update the inventory
-    for item_id, quantity in items.items():
-        inventory_item = [item for item in inventory_database if item['id'] == item_id][0]
-        inventory_item['quantity'] -= quantity
-    return f"Order with id {order_id} has been placed successfully"
\ No newline at end of file
+    return f"Order with id {order['order_id']} has been placed successfully"
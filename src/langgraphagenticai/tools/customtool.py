@@ -1,17 +1,24 @@
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 import datetime
 
+from src.langgraphagenticai.stores.tenant_state import get_tenant_state
 
-APPOINTMENTS = []
 
 @tool
-def get_next_available_appointment():
-    """Returns the next available appointment"""
-    current_time = datetime.datetime.now()
-    return f"One appointment available at {current_time + datetime.timedelta(minutes=(30 - current_time.minute % 30))}"
+def get_next_available_appointment(config: RunnableConfig, number_of_slots: int = 1):
+    """Returns the next available appointments
+
+    Args:
+        number_of_slots: How many free appointment times to return
+    """
+    slots = get_tenant_state(config).appointments().next_free_slots(datetime.datetime.now(), count=max(1, min(number_of_slots, 10)))
+    if len(slots) == 1:
+        return f"One appointment available at {slots[0]}"
+    return "Appointments available at: " + ", ".join(str(slot) for slot in slots)
 
 @tool
-def book_appointment(appointment_year: int, appointment_month: int, appointment_day: int, appointment_hour: int, appointment_minute: int, appointment_name: str):
+def book_appointment(appointment_year: int, appointment_month: int, appointment_day: int, appointment_hour: int, appointment_minute: int, appointment_name: str, config: RunnableConfig):
     """Book an appointment at the given time, you must know the exact time to book
 
     Args:
@@ -23,14 +30,12 @@ def book_appointment(appointment_year: int, appointment_month: int, appointment_
         appointment_name: The name of the person booking the appointment
     """
     time = datetime.datetime(appointment_year, appointment_month, appointment_day, appointment_hour, appointment_minute)
-    for appointment in APPOINTMENTS:
-        if appointment.time >= time and appointment.time < time + datetime.timedelta(minutes=30):
-            return f"Appointment at {time} is already booked"
-    APPOINTMENTS.append({"time": time, "name": appointment_name})
+    if not get_tenant_state(config).appointments().book(time, appointment_name):
+        return f"Appointment at {time} is already booked"
     return f"Appointment booked for {time}"
 
 @tool
-def cancel_appointment(appointment_year: int, appointment_month: int, appointment_day: int, appointment_hour: int, appointment_minute: int):
+def cancel_appointment(appointment_year: int, appointment_month: int, appointment_day: int, appointment_hour: int, appointment_minute: int, config: RunnableConfig):
     """Cancel the appointment at the given time
 
     Args:
@@ -41,8 +46,6 @@ def cancel_appointment(appointment_year: int, appointment_month: int, appointmen
         appointment_minute: The minute of the appointment
     """
     time = datetime.datetime(appointment_year, appointment_month, appointment_day, appointment_hour, appointment_minute)
-    for appointment in APPOINTMENTS:
-        if appointment["time"] == time:
-            APPOINTMENTS.remove(appointment)
-            return f"Appointment at {time} cancelled"
+    if get_tenant_state(config).appointments().cancel(time):
+        return f"Appointment at {time} cancelled"
     return f"No appointment found at {time}"
@@ -1,3 +1,4 @@
+import datetime
 import uuid
 import streamlit as st
 from langchain_core.messages import HumanMessage,AIMessage,ToolMessage
@@ -6,8 +7,11 @@ import json
 from langgraph.types import interrupt, Command
 
 from src.langgraphagenticai.ui.streamlitui.sdlcfeedback import SDLCUI
-from src.langgraphagenticai.tools.customtool import APPOINTMENTS
-from src.langgraphagenticai.tools.customer_support_tools import customers_database, data_protection_checks
+from src.langgraphagenticai.node.speculative_retrieval import speculation_stats
+from src.langgraphagenticai.stores.tenant_state import get_tenant_state
+from src.langgraphagenticai.tools.customer_support_tools import get_database
+
+DPA_CHECKS_PAGE_SIZE = 20
 
 class DisplayResultStreamlit:
     def __init__(self,usecase,graph,user_message):
@@ -15,6 +19,15 @@ class DisplayResultStreamlit:
         self.graph = graph
         self.user_message = user_message
     
+    def _session_config(self):
+        """
+        Graph config identifying this browser session to the tools. Customers, orders,
+        appointments and DPA checks are shop-wide, so a new session still sees them.
+        """
+        if 'tenant_id' not in st.session_state:
+            st.session_state.tenant_id = str(uuid.uuid4())
+        return {"configurable": {"thread_id": st.session_state.tenant_id}}
+
     def load_content_for_review(self):
         expander_labels = {
             "user_stories": "User Stories",  # generate_user_stories
@@ -73,7 +86,7 @@ class DisplayResultStreamlit:
                 "messages": CONVERSATION,
             }
             print(state)
-            new_state = graph.invoke(state)
+            new_state = graph.invoke(state, config=self._session_config())
             CONVERSATION.extend(new_state["messages"][len(CONVERSATION):])
             col1, col2 = st.columns(2)
             with col1:
@@ -87,13 +100,15 @@ class DisplayResultStreamlit:
                                 st.write(message.content)
             with col2:
                 st.header("Appointments")
-                st.write(APPOINTMENTS)
+                appointments = get_tenant_state(self._session_config()).appointments()
+                st.write(appointments.appointments(start=datetime.datetime.now() - appointments.duration))
         elif usecase == "Customer Support":
             
             main_col, right_col = st.columns([2, 1])
+            session_config = self._session_config()
             response = graph.invoke({
                 'messages': user_message
-            })
+            }, config=session_config)
             with  main_col:
                 st.session_state.message_history = response['messages']
                 for i in range(1, len(st.session_state.message_history) + 1):
@@ -107,9 +122,14 @@ class DisplayResultStreamlit:
             # 3. State variables
             with right_col:
                 st.title('customers database')
-                st.write(customers_database)
+                st.write(get_database(session_config).customers.all())
                 st.title('data protection checks')
-                st.write(data_protection_checks) 
+                data_protection_checks = get_tenant_state(session_config).data_protection_checks
+                st.caption(f"Latest {DPA_CHECKS_PAGE_SIZE} of {data_protection_checks.total} checks, full log in {data_protection_checks.path}")
+                st.write(data_protection_checks.recent(page=1, page_size=DPA_CHECKS_PAGE_SIZE))
+                if speculation_stats.counters['speculations']:
+                    st.title('speculative retrieval')
+                    st.write(speculation_stats.snapshot())
         elif usecase == "AI News":
             frequency = self.user_message
             with st.spinner("Fetching and summarizing news... ⏳"):
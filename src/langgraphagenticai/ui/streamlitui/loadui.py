@@ -5,6 +5,12 @@ from datetime import date
 
 from src.langgraphagenticai.ui.streamlitui.sdlcfeedback import SDLCUI
 from src.langgraphagenticai.ui.uiconfigfile import Config
+from src.langgraphagenticai.warmup import warmup_manager
+from src.langgraphagenticai.LLMS.client_pool import groq_client_pool
+from src.langgraphagenticai.LLMS.rate_limiter import llm_scheduler
+from src.langgraphagenticai.LLMS.resilience import resilient_invoker
+from src.langgraphagenticai.LLMS.response_cache import response_cache_store
+from src.langgraphagenticai.LLMS.semantic_cache import semantic_cache
 from langchain_core.messages import AIMessage, HumanMessage
 
 
@@ -42,6 +48,66 @@ class LoadStreamlitUI:
             st.session_state.IsSDLC = True
             
 
+    def render_warmup_status(self):
+        icons = {"pending": "⏳", "loading": "🔄", "ready": "✅", "failed": "❌"}
+        with st.expander("⚙️ Resource warm-up", expanded=not warmup_manager.is_ready()):
+            for name, status in warmup_manager.status.items():
+                detail = f" ({status['seconds']:.1f}s)" if status['seconds'] is not None else ""
+                if status['error']:
+                    detail += f" - {status['error']}"
+                st.caption(f"{icons[status['state']]} {name}: {status['state']}{detail}")
+
+    def render_llm_connection_stats(self):
+        stats = groq_client_pool.stats()
+        if not stats['requests']:
+            return
+        with st.expander("🔌 LLM connections", expanded=False):
+            st.caption(f"Client reuse: {stats['client_hit_rate']:.0%} of {stats['hits'] + stats['misses']} lookups, {stats['pooled_clients']} pooled")
+            st.caption(f"Connection reuse: {stats['connection_reuse_ratio']:.0%} of {stats['requests']} requests")
+            if stats['ttfb_saved_per_reuse_s'] is not None:
+                st.caption(f"TTFB: {stats['mean_ttfb_reused_connection_s']:.2f}s reused vs {stats['mean_ttfb_new_connection_s']:.2f}s new")
+
+    def render_llm_scheduler_stats(self):
+        stats = llm_scheduler.stats()
+        if not stats['admitted'] and not stats['rejected']:
+            return
+        with st.expander("🚦 LLM rate limits", expanded=False):
+            st.caption(f"Running: {stats['active']}, waiting: {stats['queued']} (peak {stats['max_queue_depth']})")
+            st.caption(f"Wait: interactive {stats['interactive_mean_wait_s']:.2f}s mean / {stats['interactive_p95_wait_s']:.2f}s p95, "
+                       f"background {stats['background_mean_wait_s']:.2f}s mean / {stats['background_p95_wait_s']:.2f}s p95")
+            if stats['rejected'] or stats['timed_out']:
+                st.caption(f"Turned away: {stats['rejected']} (queue full), {stats['timed_out']} (waited too long)")
+
+    def render_llm_model_health(self):
+        stats = resilient_invoker.stats()
+        if not stats['invocations']:
+            return
+        with st.expander("🩺 LLM model health", expanded=False):
+            st.caption(f"{stats['invocations']} calls, {stats['fallbacks']} fallbacks, {stats['exhausted']} failed on every model")
+            for model, health in stats['models'].items():
+                latency = f", p50 {health['p50_s']:.2f}s / p95 {health['p95_s']:.2f}s" if health['p95_s'] is not None else ""
+                state = " (circuit open)" if health['circuit_open'] else ""
+                st.caption(f"{model}{state}: {health['error_rate']:.0%} errors of {health['calls']}{latency}, "
+                           f"{health['retries']} retries, {health['hedge_wins']}/{health['hedges']} hedges won")
+
+    def render_response_cache_stats(self):
+        stats = response_cache_store.stats()
+        if not stats:
+            return
+        with st.expander("🗃️ LLM response cache", expanded=False):
+            for use_case, counters in stats.items():
+                st.caption(f"{use_case}: {counters['hit_rate']:.0%} hits of {counters['lookups']} "
+                           f"(~{counters['estimated_seconds_saved']:.1f}s saved)")
+
+    def render_semantic_cache_stats(self):
+        stats = semantic_cache.stats()
+        if not stats:
+            return
+        with st.expander("🧭 Semantic response cache", expanded=False):
+            for use_case, counters in stats.items():
+                st.caption(f"{use_case}: {counters['hit_rate']:.0%} hits of {counters['lookups']}, "
+                           f"{counters['entries']} answers cached (~{counters['estimated_seconds_saved']:.1f}s saved)")
+
     def load_streamlit_ui(self):
         st.set_page_config(page_title= "🤖 " + self.config.get_page_title(), layout="wide")
         st.header("🤖 " + self.config.get_page_title())
@@ -83,6 +149,13 @@ class LoadStreamlitUI:
                 # Validate API key
                 if not self.user_controls["TAVILY_API_KEY"]:
                     st.warning("⚠️ Please enter your TAVILY_API_KEY key to proceed. Don't have? refer : https://app.tavily.com/home")
+
+            self.render_warmup_status()
+            self.render_llm_connection_stats()
+            self.render_llm_scheduler_stats()
+            self.render_llm_model_health()
+            self.render_response_cache_stats()
+            self.render_semantic_cache_stats()
         
         if self.user_controls['selected_usecase']!="SDLC Workflow":
             st.session_state['state'] = ''
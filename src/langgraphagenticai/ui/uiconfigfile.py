@@ -6,15 +6,100 @@ class Config:
     self.config = ConfigParser()
     self.config.read(config_file)
 
+  def _list(self, key):
+    # Comma separated, with or without spaces after the commas
+    return [entry.strip() for entry in self.config["DEFAULT"].get(key, fallback="").split(",") if entry.strip()]
+
+  def _pairs(self, key):
+    # "name: value" entries; names may contain spaces but not colons
+    pairs = []
+    for entry in self._list(key):
+      name, separator, value = entry.rpartition(":")
+      if not separator or not name.strip() or not value.strip():
+        raise ValueError(f'{key}: expected comma separated "name: value" entries, got "{entry}"')
+      pairs.append((name.strip(), value.strip()))
+    return pairs
+
   def get_llm_options(self):
-    return self.config["DEFAULT"].get("LLM_OPTIONS").split(", ")
+    return self._list("LLM_OPTIONS")
 
   def get_usecase_options(self):
-    return self.config["DEFAULT"].get("USECASE_OPTIONS").split(", ")
+    return self._list("USECASE_OPTIONS")
 
   def get_groq_model_options(self):
-    return self.config["DEFAULT"].get("GROQ_MODEL_OPTIONS").split(", ")
+    return self._list("GROQ_MODEL_OPTIONS")
 
   def get_page_title(self):
     return self.config["DEFAULT"].get("PAGE_TITLE")
 
+  def get_embedding_model(self):
+    # e.g. BAAI/bge-small-en-v1.5 on CPU-only hosts
+    return self.config["DEFAULT"].get("EMBEDDING_MODEL", fallback="dunzhang/stella_en_1.5B_v5")
+
+  def get_embedding_cpu_mode(self):
+    return self.config["DEFAULT"].get("EMBEDDING_CPU_MODE", fallback="fp32")
+
+  def get_embedding_dimensions(self):
+    # Matryoshka truncation, e.g. 256, 512 or 1024; empty or 0 keeps the full vector
+    value = self.config["DEFAULT"].get("EMBEDDING_DIMENSIONS", fallback="").strip()
+    return (int(value) or None) if value else None
+
+  def get_embedding_num_threads(self):
+    return self.config["DEFAULT"].getint("EMBEDDING_NUM_THREADS", fallback=0)
+
+  def get_vector_store_backend(self):
+    return self.config["DEFAULT"].get("VECTOR_STORE_BACKEND", fallback="chroma")
+
+  def get_vector_storage_dtype(self):
+    return self.config["DEFAULT"].get("VECTOR_STORAGE_DTYPE", fallback="float32")
+
+  def get_customer_support_speculative_retrieval(self):
+    return self.config["DEFAULT"].getboolean("CUSTOMER_SUPPORT_SPECULATIVE_RETRIEVAL", fallback=False)
+
+  def get_llm_cache_ttls(self):
+    # "Use case: seconds" pairs; use cases not listed are not cached
+    ttls = {}
+    for use_case, seconds in self._pairs("LLM_CACHE_TTLS"):
+      try:
+        ttls[use_case] = float(seconds)
+      except ValueError:
+        raise ValueError(f'LLM_CACHE_TTLS: TTL for "{use_case}" must be a number of seconds, got "{seconds}"') from None
+    return ttls
+
+  def get_semantic_cache_use_cases(self):
+    return self._list("SEMANTIC_CACHE_USE_CASES")
+
+  def get_semantic_cache_threshold(self):
+    return self.config["DEFAULT"].getfloat("SEMANTIC_CACHE_THRESHOLD", fallback=0.85)
+
+  def get_semantic_cache_ttl_seconds(self):
+    return self.config["DEFAULT"].getfloat("SEMANTIC_CACHE_TTL_SECONDS", fallback=3600)
+
+  def get_groq_rate_limits(self):
+    # "model: requests per minute/tokens per minute" pairs
+    limits = {}
+    for model, rates in self._pairs("GROQ_RATE_LIMITS"):
+      try:
+        requests_per_minute, tokens_per_minute = rates.split("/")
+        limits[model] = (float(requests_per_minute), float(tokens_per_minute))
+      except ValueError:
+        raise ValueError(f'GROQ_RATE_LIMITS: limits for "{model}" must be "requests per minute/tokens per minute", got "{rates}"') from None
+    return limits
+
+  def get_groq_max_concurrent_requests(self):
+    return self.config["DEFAULT"].getint("GROQ_MAX_CONCURRENT_REQUESTS", fallback=4)
+
+  def get_groq_max_queued_requests(self):
+    return self.config["DEFAULT"].getint("GROQ_MAX_QUEUED_REQUESTS", fallback=32)
+
+  def get_llm_background_use_cases(self):
+    return self._list("LLM_BACKGROUND_USE_CASES")
+
+  def get_groq_fallback_models(self):
+    return self._list("GROQ_FALLBACK_MODELS")
+
+  def get_llm_max_attempts_per_model(self):
+    return self.config["DEFAULT"].getint("LLM_MAX_ATTEMPTS_PER_MODEL", fallback=3)
+
+  def get_llm_hedge_requests(self):
+    return self.config["DEFAULT"].getboolean("LLM_HEDGE_REQUESTS", fallback=False)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+EMBEDDING_CACHE_PATH = './.embedding_cache'
+EMBEDDING_CACHE_MAX_ENTRIES = 20000
+
+
+class EmbeddingCache:
+    """
+    Content-addressed, on-disk cache of text embeddings for one model.
+
+    Vectors live in a preallocated memory-mapped float32 matrix and a JSON index maps
+    sha256(model name, text) to its row. The index is kept in least-recently-used
+    order, so when the matrix is full the oldest row is overwritten.
+
+    On disk the index is a snapshot plus a log: each put_many appends one line per
+    row it wrote, and the snapshot is only rewritten (and the log emptied) once the
+    log holds more lines than the matrix has rows. Reads are not logged, so after a
+    restart the LRU order is the order rows were written in.
+    """
+    def __init__(self, model_name: str, cache_dir: str = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._matrix_path = os.path.join(cache_dir, f'{slug}.f32')
+        self._index_path = os.path.join(cache_dir, f'{slug}.index.json')
+        self._log_path = os.path.join(cache_dir, f'{slug}.index.log')
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._logged = 0
+        self._dimension: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f'{self.model_name}\x00{text}'.encode('utf-8')).hexdigest()
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path) or not os.path.exists(self._matrix_path):
+            return
+        try:
+            with open(self._index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            # A torn index only costs us a re-embed, so start empty rather than fail
+            return
+        if index.get('model_name') != self.model_name or index.get('max_entries') != self.max_entries:
+            return
+        self._dimension = index['dimension']
+        self._rows = OrderedDict(index['rows'])
+        self._replay_log()
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode='r+', shape=(self.max_entries, self._dimension))
+
+    def _replay_log(self):
+        keys = {row: key for key, row in self._rows.items()}
+        try:
+            with open(self._log_path, 'r') as f:
+                for line in f:
+                    try:
+                        key, row = json.loads(line)
+                    except ValueError:
+                        # Only the last line can be torn, by a crash mid-append
+                        continue
+                    # The row may have been taken over from an evicted key
+                    if keys.get(row, key) != key:
+                        del self._rows[keys[row]]
+                    keys[row] = key
+                    self._rows[key] = row
+                    self._rows.move_to_end(key)
+                    self._logged += 1
+        except FileNotFoundError:
+            return
+
+    def _ensure_matrix(self, dimension: int):
+        if self._matrix is not None:
+            if dimension != self._dimension:
+                raise ValueError(f"Embedding dimension changed from {self._dimension} to {dimension} for {self.model_name}")
+            return
+        self._dimension = dimension
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode='w+', shape=(self.max_entries, dimension))
+        # A new matrix makes any earlier index and log meaningless
+        self._write_snapshot()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Returns the cached embedding for each text, or None where it is not cached.
+        """
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                row = self._rows.get(key)
+                if row is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    self._rows.move_to_end(key)
+                    results.append(self._matrix[row].tolist())
+        return results
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        if not texts:
+            return
+        with self._lock:
+            self._ensure_matrix(len(embeddings[0]))
+            written = []
+            for text, embedding in zip(texts, embeddings):
+                key = self.key(text)
+                row = self._rows.get(key)
+                if row is None:
+                    if len(self._rows) < self.max_entries:
+                        row = len(self._rows)
+                    else:
+                        _, row = self._rows.popitem(last=False)
+                        self.evictions += 1
+                    self._rows[key] = row
+                else:
+                    self._rows.move_to_end(key)
+                self._matrix[row] = np.asarray(embedding, dtype=np.float32)
+                written.append((key, row))
+            self._flush(written)
+
+    def _flush(self, written: List[tuple]):
+        # Vectors first, so the index never points at a row that was not written
+        self._matrix.flush()
+        if self._logged + len(written) > self.max_entries:
+            self._write_snapshot()
+            return
+        with open(self._log_path, 'a') as f:
+            f.write(''.join(json.dumps([key, row]) + '\n' for key, row in written))
+        self._logged += len(written)
+
+    def _write_snapshot(self):
+        tmp_path = self._index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'model_name': self.model_name,
+                'dimension': self._dimension,
+                'max_entries': self.max_entries,
+                'rows': self._rows,
+            }, f)
+        os.replace(tmp_path, self._index_path)
+        # The snapshot now covers everything logged
+        open(self._log_path, 'w').close()
+        self._logged = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._rows),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
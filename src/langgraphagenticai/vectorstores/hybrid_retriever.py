@@ -0,0 +1,163 @@
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.langgraphagenticai.vectorstores.ingestion import faq_records
+
+LEXICAL_CONFIDENCE_THRESHOLD = 0.65
+LEXICAL_MIN_MARGIN = 0.3
+MIN_LEXICAL_QUERY_TERMS = 2
+
+# Set while a lookup runs ahead of the agent asking for it (see speculative_retrieval.py);
+# such lookups are counted apart so they do not skew the path hit rates
+speculative_lookup: ContextVar[bool] = ContextVar('speculative_lookup', default=False)
+
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i if in is it me my of on or our so
+that the this to we what when where which who why will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r"[a-z0-9]+", text.lower()) if token not in STOPWORDS]
+
+
+def normalise_question(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed set of documents, backed by an inverted index of
+    term -> [(document position, term frequency)]. Results are keyed by the
+    document ids given (by default the position as a string).
+    """
+    def __init__(self, documents: List[str], ids: Optional[List[str]] = None, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids = ids if ids is not None else [str(position) for position in range(len(documents))]
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_lengths: List[int] = []
+        self.doc_terms: Dict[str, frozenset] = {}
+        for position, document in enumerate(documents):
+            tokens = tokenize(document)
+            self.doc_lengths.append(len(tokens))
+            self.doc_terms[self.ids[position]] = frozenset(tokens)
+            for term, frequency in Counter(tokens).items():
+                self.postings[term].append((position, frequency))
+        self.average_length = sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        total = len(self.doc_lengths)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query_terms: List[str], n_results: int) -> List[Tuple[str, float]]:
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(query_terms):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, frequency in self.postings[term]:
+                length_norm = 1 - self.b + self.b * self.doc_lengths[position] / self.average_length
+                scores[position] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n_results]
+        return [(self.ids[position], score) for position, score in ranked]
+
+    def confidence(self, query_terms: List[str], doc_id: str) -> float:
+        """
+        Share of the query's total idf weight that the document matched, in [0, 1].
+        Unknown terms count against the match, so off-topic questions stay low.
+        """
+        unique_terms = set(query_terms)
+        known_idf = [self.idf[term] for term in unique_terms if term in self.idf]
+        if not known_idf:
+            return 0.0
+        # Terms we have never seen get the highest idf, as they are the rarest possible
+        weight = sum(known_idf) + max(self.idf.values()) * (len(unique_terms) - len(known_idf))
+        matched = sum(self.idf[term] for term in unique_terms & self.doc_terms[doc_id])
+        return matched / weight
+
+
+class HybridFAQRetriever:
+    """
+    Answers FAQ lookups through the cheapest path that is confident enough:
+
+    1. exact match on the normalised question text,
+    2. BM25 over the question and answer text,
+    3. the embedding search in FlowerShopVectorStore.
+
+    Results have the same shape as a Chroma query result, whichever path served them,
+    and use the ids the FAQ question records are ingested under, so a hit means the
+    same record whichever path found it.
+    """
+    def __init__(self, faqs: List[Dict], vector_query: Callable[[str], Dict],
+                 confidence_threshold: float = LEXICAL_CONFIDENCE_THRESHOLD,
+                 min_margin: float = LEXICAL_MIN_MARGIN,
+                 min_query_terms: int = MIN_LEXICAL_QUERY_TERMS):
+        self.faqs = faqs
+        self.vector_query = vector_query
+        self.confidence_threshold = confidence_threshold
+        self.min_margin = min_margin
+        self.min_query_terms = min_query_terms
+        # faq_records yields a question record then an answer record per FAQ
+        self.records = {record.id: record for record in faq_records(faqs)[::2]}
+        self.exact_matches = {normalise_question(record.document): record_id for record_id, record in self.records.items()}
+        self.index = BM25Index([f"{faq['question']} {faq['question']} {faq['answer']}" for faq in faqs], ids=list(self.records))
+        self._lock = threading.Lock()
+        self.counters = {'exact': 0, 'lexical': 0, 'vector': 0}
+        self.speculative_queries = 0
+
+    @classmethod
+    def from_file(cls, faq_file_path: str, vector_query: Callable[[str], Dict], **kwargs) -> "HybridFAQRetriever":
+        with open(faq_file_path, 'r') as f:
+            return cls(json.load(f), vector_query, **kwargs)
+
+    def _result(self, ranked: List[Tuple[str, float]]) -> Dict:
+        return {
+            'ids': [[record_id for record_id, _ in ranked]],
+            'documents': [[self.records[record_id].document for record_id, _ in ranked]],
+            'metadatas': [[self.records[record_id].metadata for record_id, _ in ranked]],
+            'distances': [[1.0 - confidence for _, confidence in ranked]],
+        }
+
+    def _count(self, path: str):
+        with self._lock:
+            if speculative_lookup.get():
+                self.speculative_queries += 1
+            else:
+                self.counters[path] += 1
+
+    def query(self, query: str, n_results: int = 5) -> Dict:
+        record_id = self.exact_matches.get(normalise_question(query))
+        if record_id is not None:
+            self._count('exact')
+            return self._result([(record_id, 1.0)])
+
+        terms = tokenize(query)
+        if len(set(terms)) >= self.min_query_terms:
+            ranked = [(record_id, self.index.confidence(terms, record_id)) for record_id, _ in self.index.search(terms, n_results)]
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            # A near tie means the keywords do not pick out one FAQ, so let the embeddings decide
+            if ranked and ranked[0][1] >= self.confidence_threshold and ranked[0][1] - runner_up >= self.min_margin:
+                self._count('lexical')
+                return self._result(ranked)
+
+        self._count('vector')
+        return self.vector_query(query)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            speculative = self.speculative_queries
+        total = sum(counters.values())
+        return {
+            'queries': total,
+            **counters,
+            **{f'{path}_hit_rate': (count / total if total else 0.0) for path, count in counters.items()},
+            'speculative_queries': speculative,
+        }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 256
+
+
+class Record(NamedTuple):
+    id: str
+    document: str
+    metadata: Dict
+
+
+def content_hash(record: Record) -> str:
+    payload = json.dumps([record.document, record.metadata], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def faq_records(faqs: List[Dict]) -> List[Record]:
+    """
+    Every FAQ is stored twice, once embedded by its question and once by its answer.
+    Ids are derived from the question text so that editing an answer updates the
+    existing records instead of shifting every id after it.
+    """
+    records = []
+    seen = {}
+    for faq in faqs:
+        key = hashlib.sha1(faq['question'].strip().lower().encode('utf-8')).hexdigest()[:16]
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}-{seen[key]}"
+        metadata = {'question': faq['question'], 'answer': faq['answer']}
+        records.append(Record(f"faq-{key}-q", faq['question'], metadata))
+        records.append(Record(f"faq-{key}-a", faq['answer'], metadata))
+    return records
+
+
+def inventory_records(inventories: List[Dict]) -> List[Record]:
+    return [Record(str(item['id']), item['description'], item) for item in inventories]
+
+
+class IncrementalIngestor:
+    """
+    Keeps a collection in step with a JSON source file.
+
+    A manifest next to the collection stores the hash of the source file and of every
+    record that was written. On sync only added or changed records are upserted (and
+    therefore embedded) and records that disappeared from the source are deleted, so
+    startup after a data edit costs O(changed records).
+    """
+    def __init__(self, collection, manifest_path: str):
+        self.collection = collection
+        self.manifest_path = manifest_path
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict):
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def sync(self, source_path: str, to_records) -> Dict[str, int]:
+        """
+        Args:
+            source_path (str): JSON file to ingest
+            to_records: Callable turning the parsed JSON into a list of Record
+
+        Returns:
+            Dict[str, int]: Number of added, updated, deleted and unchanged records
+        """
+        manifest = self._read_manifest()
+        source_hash = file_hash(source_path)
+        known = manifest.get('records', {})
+        if manifest.get('source_hash') == source_hash and self.collection.count() == len(known):
+            return {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': len(known)}
+
+        if not known:
+            # No manifest yet: whatever is already in the collection has to be reconciled
+            known = {record_id: None for record_id in self.collection.get(include=[])['ids']}
+
+        with open(source_path, 'r') as f:
+            records = to_records(json.load(f))
+        hashes = {record.id: content_hash(record) for record in records}
+
+        changed = [record for record in records if known.get(record.id) != hashes[record.id]]
+        removed = [record_id for record_id in known if record_id not in hashes]
+
+        for start in range(0, len(changed), UPSERT_BATCH_SIZE):
+            batch = changed[start:start + UPSERT_BATCH_SIZE]
+            self.collection.upsert(
+                ids=[record.id for record in batch],
+                documents=[record.document for record in batch],
+                metadatas=[record.metadata for record in batch],
+            )
+        if removed:
+            self.collection.delete(ids=removed)
+        # Collections that buffer writes (NumpyCollection) save once per sync; Chroma writes as it goes
+        persist = getattr(self.collection, 'persist', None)
+        if persist is not None:
+            persist()
+
+        self._write_manifest({'source_path': source_path, 'source_hash': source_hash, 'records': hashes})
+
+        summary = {
+            'added': sum(1 for record in changed if record.id not in known),
+            'updated': sum(1 for record in changed if record.id in known),
+            'deleted': len(removed),
+            'unchanged': len(records) - len(changed),
+        }
+        logger.info("Synced %s from %s: %s", self.collection.name, source_path, summary)
+        return summary
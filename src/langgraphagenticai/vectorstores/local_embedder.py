@@ -0,0 +1,45 @@
+import re
+import zlib
+from typing import List
+
+import numpy as np
+from chromadb import EmbeddingFunction, Embeddings
+
+
+LOCAL_EMBEDDING_DIMENSION = 384
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """
+    Small, dependency-free stand-in for the HuggingFace model.
+
+    Words, word bigrams and character trigrams are hashed into a fixed number of
+    signed buckets and the result is L2-normalised. It needs no download and no
+    GPU, so benchmarks and caches can run anywhere; the quality is closer to
+    TF-IDF than to a neural embedding.
+    """
+    def __init__(self, dimension: int = LOCAL_EMBEDDING_DIMENSION):
+        self.model_name = f'local-hashing-{dimension}'
+        self.dimension = dimension
+        # Matches CustomEmbeddingClass so FlowerShopVectorStore can use either
+        self.dimensions = None
+
+    def _features(self, text: str) -> List[str]:
+        words = re.findall(r"[a-z0-9']+", text.lower())
+        features = list(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for feature in self._features(text):
+            digest = zlib.crc32(feature.encode('utf-8'))
+            vector[digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def __call__(self, input_texts: List[str]) -> Embeddings:
+        return [self.embed(text).tolist() for text in input_texts]
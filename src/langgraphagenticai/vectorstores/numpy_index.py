@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+NUMPY_INDEX_PATH = './.numpy_index'
+STORAGE_DTYPES = ('float32', 'float16', 'int8')
+
+
+def normalise(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def quantise(matrix: np.ndarray, storage_dtype: str):
+    """
+    Returns (stored matrix, per-row scales). int8 rows are scaled so their largest
+    component maps to 127; float16 and float32 need no scale.
+    """
+    if storage_dtype == 'int8':
+        scales = np.abs(matrix).max(axis=1) / 127.0 if len(matrix) else np.empty(0, dtype=np.float32)
+        scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+        return np.round(matrix / scales[:, None]).astype(np.int8), scales
+    if storage_dtype in STORAGE_DTYPES:
+        return matrix.astype(storage_dtype), None
+    raise ValueError(f"Unsupported storage dtype: {storage_dtype}")
+
+
+def dequantise(matrix: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    matrix = np.array(matrix, dtype=np.float32)
+    return matrix if scales is None else matrix * scales[:, None]
+
+
+class NumpyCollection:
+    """
+    Exact cosine-similarity search over a .npy matrix.
+
+    Implements the part of the Chroma collection API that FlowerShopVectorStore and
+    IncrementalIngestor use (count, get, upsert, delete, query), so it can stand in
+    for a Chroma collection. Rows are L2-normalised on write, which makes a query a
+    single matrix product followed by argpartition for the top k. Rows can be stored
+    as float16, or as int8 with a per-row scale, to cut memory and I/O.
+
+    Rows live in a preallocated buffer that doubles when full, so upserting in
+    batches costs O(rows added) rather than copying the whole matrix each time.
+    Changes are kept in memory until persist() writes them out, which
+    IncrementalIngestor does once per sync. The saved matrix is memory-mapped on
+    load and only copied into a buffer on the first write.
+    """
+    def __init__(self, name: str, path: str, embedding_function=None, storage_dtype: str = 'float32'):
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Unsupported storage dtype: {storage_dtype}")
+        self.name = name
+        self.embedding_function = embedding_function
+        self.storage_dtype = storage_dtype
+        self._lock = threading.Lock()
+        self._dir = os.path.join(path, name)
+        self._matrix_path = os.path.join(self._dir, 'embeddings.npy')
+        self._records_path = os.path.join(self._dir, 'records.json')
+        self._scales_path = os.path.join(self._dir, 'scales.npy')
+        os.makedirs(self._dir, exist_ok=True)
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._positions: Dict[str, int] = {}
+        # Rows [0, count) are in use; _owned is False while _buffer is the read-only memory map
+        self._buffer: Optional[np.ndarray] = None
+        self._scale_buffer: Optional[np.ndarray] = None
+        self._owned = False
+        self._dirty = False
+        self._snapshot = ([], [], [], None, None)
+        self._load()
+
+    def _load(self):
+        if not (os.path.exists(self._matrix_path) and os.path.exists(self._records_path)):
+            return
+        with open(self._records_path, 'r') as f:
+            records = json.load(f)
+        stored_dtype = records.get('storage_dtype', 'float32')
+        matrix = np.load(self._matrix_path, mmap_mode='r')
+        scales = np.load(self._scales_path) if stored_dtype == 'int8' else None
+        self._ids, self._documents, self._metadatas = records['ids'], records['documents'], records['metadatas']
+        self._positions = {record_id: i for i, record_id in enumerate(self._ids)}
+        if stored_dtype != self.storage_dtype:
+            self._buffer, self._scale_buffer = quantise(dequantise(matrix, scales), self.storage_dtype)
+            self._owned = True
+            self._publish()
+            # Written back in the configured dtype so the conversion only happens once
+            self._dirty = True
+            self.persist()
+            return
+        self._buffer, self._scale_buffer = matrix, scales
+        self._publish()
+
+    def _publish(self):
+        # Queries read the snapshot without the lock. The lists are shared rather than
+        # copied: rows past the snapshot's matrix are appended later and never read,
+        # and delete builds new lists.
+        size = len(self._ids)
+        matrix = None if self._buffer is None else self._buffer[:size]
+        scales = None if self._scale_buffer is None else self._scale_buffer[:size]
+        self._snapshot = (self._ids, self._documents, self._metadatas, matrix, scales)
+
+    def _reserve(self, rows: int, dimension: int):
+        """
+        Makes room for rows rows in an owned buffer. Growing allocates a new buffer,
+        so a snapshot taken before still sees the rows it was taken with.
+        """
+        capacity = 0 if self._buffer is None or not self._owned else len(self._buffer)
+        if rows <= capacity:
+            return
+        size = len(self._ids)
+        capacity = max(rows, 2 * capacity, 16)
+        buffer = np.zeros((capacity, dimension), dtype=self.storage_dtype)
+        scale_buffer = np.ones(capacity, dtype=np.float32) if self.storage_dtype == 'int8' else None
+        if self._buffer is not None:
+            buffer[:size] = self._buffer[:size]
+            if scale_buffer is not None:
+                scale_buffer[:size] = self._scale_buffer[:size]
+        self._buffer, self._scale_buffer, self._owned = buffer, scale_buffer, True
+
+    def persist(self):
+        """
+        Writes the matrix and records out if they changed since the last write.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            size = len(self._ids)
+            dimension = 0 if self._buffer is None else self._buffer.shape[1]
+            stored = self._buffer[:size] if self._buffer is not None else np.empty((0, dimension), dtype=self.storage_dtype)
+            # Write to temporary files and swap them in so a crash never leaves a torn index
+            tmp_matrix_path = self._matrix_path + '.tmp.npy'
+            np.save(tmp_matrix_path, stored)
+            if self._scale_buffer is not None:
+                np.save(self._scales_path + '.tmp.npy', self._scale_buffer[:size])
+            tmp_records_path = self._records_path + '.tmp'
+            with open(tmp_records_path, 'w') as f:
+                json.dump({'ids': self._ids, 'documents': self._documents, 'metadatas': self._metadatas,
+                           'storage_dtype': self.storage_dtype}, f)
+            os.replace(tmp_matrix_path, self._matrix_path)
+            if self._scale_buffer is not None:
+                os.replace(self._scales_path + '.tmp.npy', self._scales_path)
+            os.replace(tmp_records_path, self._records_path)
+            self._dirty = False
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        if self.embedding_function is None:
+            raise ValueError(f"Collection {self.name} has no embedding function to embed texts with")
+        return normalise(self.embedding_function(list(texts)))
+
+    def count(self) -> int:
+        matrix = self._snapshot[3]
+        return 0 if matrix is None else len(matrix)
+
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None) -> Dict:
+        record_ids, documents, metadatas, matrix, _ = self._snapshot
+        size = 0 if matrix is None else len(matrix)
+        positions = {record_ids[i]: i for i in range(size)}
+        selected = range(size) if ids is None else [positions[i] for i in ids if i in positions]
+        return {
+            'ids': [record_ids[i] for i in selected],
+            'documents': [documents[i] for i in selected],
+            'metadatas': [metadatas[i] for i in selected],
+        }
+
+    def upsert(self, ids: List[str], documents: List[str], metadatas: List[Dict], embeddings=None):
+        vectors = self._embed(documents) if embeddings is None else normalise(embeddings)
+        stored, scales = quantise(vectors, self.storage_dtype)
+        with self._lock:
+            new_ids = [record_id for record_id in dict.fromkeys(ids) if record_id not in self._positions]
+            self._reserve(len(self._ids) + len(new_ids), vectors.shape[1])
+            for record_id, document, metadata, row in zip(ids, documents, metadatas, range(len(stored))):
+                position = self._positions.get(record_id)
+                if position is None:
+                    position = self._positions[record_id] = len(self._ids)
+                    self._ids.append(record_id)
+                    self._documents.append(document)
+                    self._metadatas.append(metadata)
+                else:
+                    # Updated in place: a query already running may see either vector
+                    self._documents[position] = document
+                    self._metadatas[position] = metadata
+                self._buffer[position] = stored[row]
+                if scales is not None:
+                    self._scale_buffer[position] = scales[row]
+            self._dirty = True
+            self._publish()
+
+    def delete(self, ids: List[str]):
+        with self._lock:
+            drop = {self._positions[i] for i in ids if i in self._positions}
+            if not drop:
+                return
+            keep = [i for i in range(len(self._ids)) if i not in drop]
+            # Compacted into new arrays so running queries keep their snapshot's rows
+            self._buffer = np.array(self._buffer[keep])
+            self._scale_buffer = None if self._scale_buffer is None else self._scale_buffer[keep]
+            self._owned = True
+            self._ids = [self._ids[i] for i in keep]
+            self._documents = [self._documents[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._positions = {record_id: i for i, record_id in enumerate(self._ids)}
+            self._dirty = True
+            self._publish()
+
+    def query(self, query_texts: Optional[List[str]] = None, query_embeddings=None, n_results: int = 10) -> Dict:
+        """
+        Answers every query in one batch. The result has the same shape as a Chroma
+        query result: one inner list per query, with cosine distances.
+        """
+        queries = self._embed(query_texts) if query_embeddings is None else normalise(query_embeddings)
+        record_ids, documents, metadatas, matrix, scales = self._snapshot
+        result = {'ids': [], 'documents': [], 'metadatas': [], 'distances': []}
+        if matrix is None or len(matrix) == 0:
+            for _ in range(len(queries)):
+                for key in result:
+                    result[key].append([])
+            return result
+
+        k = min(n_results, len(matrix))
+        scores = queries @ matrix.T
+        if scales is not None:
+            scores = scores * scales
+        if k < len(matrix):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(len(matrix)), (len(queries), 1))
+        for row_scores, candidates in zip(scores, top):
+            ranked = candidates[np.argsort(-row_scores[candidates])]
+            result['ids'].append([record_ids[i] for i in ranked])
+            result['documents'].append([documents[i] for i in ranked])
+            result['metadatas'].append([metadatas[i] for i in ranked])
+            result['distances'].append((1.0 - row_scores[ranked]).tolist())
+        return result
+
+
+class NumpyVectorClient:
+    """
+    Drop-in for chromadb.PersistentClient that hands out NumpyCollection objects.
+    """
+    def __init__(self, path: str = NUMPY_INDEX_PATH, storage_dtype: str = 'float32'):
+        self.path = path
+        self.storage_dtype = storage_dtype
+        self._collections: Dict[str, NumpyCollection] = {}
+
+    def get_or_create_collection(self, name: str, embedding_function=None) -> NumpyCollection:
+        if name not in self._collections:
+            self._collections[name] = NumpyCollection(name, self.path, embedding_function, self.storage_dtype)
+        return self._collections[name]
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from src.langgraphagenticai.ui.uiconfigfile import Config
+from src.langgraphagenticai.vectorstores.embedding_cache import EmbeddingCache
+from src.langgraphagenticai.vectorstores.hybrid_retriever import HybridFAQRetriever
+from src.langgraphagenticai.vectorstores.vectore_store import FAQ_FILE_PATH, CustomEmbeddingClass, FlowerShopVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class VectorStoreRegistry:
+    """
+    Process-wide holder for the flower shop vector store.
+
+    The embedding model and the Chroma client are expensive to build, so they are
+    created lazily on first use and then shared by every Streamlit session and by
+    both the FAQ and Inventory collections. Concurrent first callers wait on the
+    same initialisation instead of starting their own.
+    """
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self._store_lock = threading.Lock()
+        self._embedding_lock = threading.Lock()
+        # Separate from _store_lock, which is held through the model load and ingestion
+        self._retriever_lock = threading.Lock()
+        self._store: Optional[FlowerShopVectorStore] = None
+        self._faq_retriever: Optional[HybridFAQRetriever] = None
+        self._embedding_functions: Dict[str, CustomEmbeddingClass] = {}
+        self._timings = {
+            "embedding_model_load_seconds": None,
+            "cold_load_seconds": None,
+            "last_warm_load_seconds": None,
+            "warm_loads": 0,
+        }
+
+    def get_embedding_function(self, model_name: str = None) -> CustomEmbeddingClass:
+        model_name = model_name or self.config.get_embedding_model()
+        embedding_function = self._embedding_functions.get(model_name)
+        if embedding_function is not None:
+            return embedding_function
+        with self._embedding_lock:
+            embedding_function = self._embedding_functions.get(model_name)
+            if embedding_function is None:
+                started = time.perf_counter()
+                embedding_function = CustomEmbeddingClass(
+                    model_name,
+                    dimensions=self.config.get_embedding_dimensions(),
+                    cpu_mode=self.config.get_embedding_cpu_mode(),
+                    num_threads=self.config.get_embedding_num_threads(),
+                )
+                # Quantised weights give slightly different vectors, so they are cached separately.
+                # Named after the mode actually in use, which is fp32 if quantisation was not possible
+                cpu_mode = embedding_function.cpu_mode
+                embedding_function.cache = EmbeddingCache(model_name if cpu_mode == 'fp32' else f'{model_name}@{cpu_mode}')
+                self._timings["embedding_model_load_seconds"] = time.perf_counter() - started
+                self._embedding_functions[model_name] = embedding_function
+        return embedding_function
+
+    def get_store(self) -> FlowerShopVectorStore:
+        started = time.perf_counter()
+        store = self._store
+        if store is None:
+            with self._store_lock:
+                store = self._store
+                if store is None:
+                    store = FlowerShopVectorStore(
+                        embedding_function=self.get_embedding_function(),
+                        backend=self.config.get_vector_store_backend(),
+                        storage_dtype=self.config.get_vector_storage_dtype(),
+                    )
+                    self._timings["cold_load_seconds"] = time.perf_counter() - started
+                    logger.info("Flower shop vector store loaded in %.2fs", self._timings["cold_load_seconds"])
+                    self._store = store
+                    return store
+        self._timings["last_warm_load_seconds"] = time.perf_counter() - started
+        self._timings["warm_loads"] += 1
+        return store
+
+    def get_faq_retriever(self) -> HybridFAQRetriever:
+        # The vector store is only built once a query actually falls through to it
+        if self._faq_retriever is None:
+            with self._retriever_lock:
+                if self._faq_retriever is None:
+                    self._faq_retriever = HybridFAQRetriever.from_file(
+                        FAQ_FILE_PATH, lambda query: self.get_store().query_faqs(query)
+                    )
+        return self._faq_retriever
+
+    def is_loaded(self) -> bool:
+        return self._store is not None
+
+    def load_timings(self) -> Dict:
+        return dict(self._timings)
+
+    def embedding_cache_stats(self) -> Dict:
+        return {
+            model_name: embedding_function.cache.stats()
+            for model_name, embedding_function in self._embedding_functions.items()
+            if embedding_function.cache is not None
+        }
+
+
+vector_store_registry = VectorStoreRegistry()
+
+
+def get_flower_shop_vector_store() -> FlowerShopVectorStore:
+    """
+    Returns the shared FlowerShopVectorStore, building it on first use.
+    """
+    return vector_store_registry.get_store()
+
+
+def get_faq_retriever() -> HybridFAQRetriever:
+    """
+    Returns the shared exact/BM25/vector FAQ retriever used by query_knowledge_base.
+    """
+    return vector_store_registry.get_faq_retriever()
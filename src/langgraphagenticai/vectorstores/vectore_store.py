@@ -1,13 +1,38 @@
 from chromadb import PersistentClient, EmbeddingFunction, Embeddings
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from typing import List
-import json
+from typing import List, Optional
+import logging
+import os
+import re
+
+import numpy as np
+
+from src.langgraphagenticai.vectorstores.embedding_cache import EmbeddingCache
+from src.langgraphagenticai.vectorstores.ingestion import IncrementalIngestor, faq_records, inventory_records
+from src.langgraphagenticai.vectorstores.numpy_index import NUMPY_INDEX_PATH, NumpyVectorClient
 
 
 MODEL_NAME = 'dunzhang/stella_en_1.5B_v5'
+# Drop-in for CPU-only hosts where stella is too slow or too large to load
+SMALL_MODEL_NAME = 'BAAI/bge-small-en-v1.5'
 DB_PATH = './.chroma_db'
 FAQ_FILE_PATH= './data/FAQ.json'
 INVENTORY_FILE_PATH = './data/inventory.json'
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_MAX_LENGTH = 512
+# Matryoshka truncation of the stella vectors, e.g. 256, 512 or 1024; None keeps the full vector
+# (EMBEDDING_DIMENSIONS in uiconfigfile.ini)
+EMBEDDING_DIMENSIONS = None
+# 'chroma' or 'numpy' (in-process exact search, see numpy_index.py); set VECTOR_STORE_BACKEND in uiconfigfile.ini
+VECTOR_STORE_BACKEND = 'chroma'
+# 'float32', 'float16' or 'int8'; only the numpy backend stores quantised vectors (VECTOR_STORAGE_DTYPE in uiconfigfile.ini)
+VECTOR_STORAGE_DTYPE = 'float32'
+# 'fp32' runs the model as loaded; 'int8' applies dynamic int8 quantisation to its linear layers on CPU
+EMBEDDING_CPU_MODES = ('fp32', 'int8')
+EMBEDDING_CPU_MODE = 'fp32'
+# Torch intra-op threads for embedding; 0 keeps torch's default
+EMBEDDING_NUM_THREADS = 0
+
+logger = logging.getLogger(__name__)
 
 class Product:
     def __init__(self, name: str, id: str, description: str, type: str, price: float, quantity: int):
@@ -24,99 +49,148 @@ class QuestionAnswerPairs:
         self.answer = answer
 
 class CustomEmbeddingClass(EmbeddingFunction):
-    def __init__(self, model_name):
-        self.embedding_model = HuggingFaceEmbedding(model_name=MODEL_NAME)
+    def __init__(self, model_name, batch_size: int = EMBEDDING_BATCH_SIZE, max_length: int = EMBEDDING_MAX_LENGTH, cache: EmbeddingCache = None,
+                 dimensions: Optional[int] = EMBEDDING_DIMENSIONS, cpu_mode: str = EMBEDDING_CPU_MODE,
+                 num_threads: int = EMBEDDING_NUM_THREADS):
+        if cpu_mode not in EMBEDDING_CPU_MODES:
+            raise ValueError(f"Unknown embedding CPU mode: {cpu_mode}")
+        self.model_name = model_name
+        self.cache = cache
+        self.dimensions = dimensions
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.cpu_mode = cpu_mode
+        # Imported here so users of the offline embedder never pay for torch/transformers
+        import torch
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.embedding_model = HuggingFaceEmbedding(
+            model_name=model_name,
+            embed_batch_size=self.batch_size,
+            max_length=max_length,
+            device='cpu' if cpu_mode == 'int8' else None,
+        )
+        if cpu_mode == 'int8':
+            self._quantise(torch)
+
+    def _quantise(self, torch):
+        # Dynamic quantisation only supports CPU; weights are stored as int8 and
+        # activations are quantised on the fly, which roughly quarters the Linear weights.
+        # HuggingFaceEmbedding keeps its model in a private attribute, so check it is
+        # still there and fall back to fp32 rather than failing if a release moves it.
+        model = getattr(self.embedding_model, '_model', None)
+        if not isinstance(model, torch.nn.Module):
+            logger.warning("Cannot reach the torch model inside HuggingFaceEmbedding for %s; running it in fp32 instead of int8",
+                           self.model_name)
+            self.cpu_mode = 'fp32'
+            return
+        try:
+            torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        except Exception:
+            logger.warning("int8 quantisation of %s failed; running it in fp32", self.model_name, exc_info=True)
+            self.cpu_mode = 'fp32'
 
     def __call__(self, input_texts: List[str]) -> Embeddings:
-        return [self.embedding_model.get_text_embedding(text) for text in input_texts]
-
-class FAQCollection:
-    def __init__(self):
-        self.documents = []
-        self.ids = []
-        self.metadatas = []
-
-    def add(self, documents, ids, metadatas):
-        self.documents.extend(documents)
-        self.ids.extend(ids)
-        self.metadatas.extend(metadatas)
-
-    def display(self):
-        for doc, id_, meta in zip(self.documents, self.ids, self.metadatas):
-            print(f"ID: {id_}, Document: {doc}, Metadata: {meta}")
-
-# Define the InventoryCollection class
-class InventoryCollection:
-    def __init__(self):
-        self.documents = []
-        self.ids = []
-        self.metadatas = []
-
-    def add(self, documents, ids, metadatas):
-        self.documents.extend(documents)
-        self.ids.extend(ids)
-        self.metadatas.extend(metadatas)
-
-    def display(self):
-        for doc, id_, meta in zip(self.documents, self.ids, self.metadatas):
-            print(f"ID: {id_}, Document: {doc}, Metadata: {meta}")
-
-
+        return self.truncate(self.full_embeddings(input_texts))
+
+    def truncate(self, embeddings: Embeddings) -> Embeddings:
+        """
+        Keeps the leading `dimensions` components and re-normalises them. stella is
+        trained Matryoshka-style, so the prefix is itself a usable embedding.
+        """
+        if not self.dimensions or not embeddings:
+            return embeddings
+        matrix = np.asarray(embeddings, dtype=np.float32)[:, :self.dimensions]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+    def full_embeddings(self, input_texts: List[str]) -> Embeddings:
+        # The cache holds full-length vectors so changing `dimensions` never invalidates it
+        if self.cache is None:
+            return self._embed(input_texts)
+
+        embeddings = self.cache.get_many(input_texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            computed = self._embed([input_texts[i] for i in missing])
+            self.cache.put_many([input_texts[i] for i in missing], computed)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+        return embeddings
+
+    def _embed(self, input_texts: List[str]) -> Embeddings:
+        embeddings = []
+        for start in range(0, len(input_texts), self.batch_size):
+            embeddings.extend(self._embed_batch(input_texts[start:start + self.batch_size]))
+        return embeddings
+
+    def _embed_batch(self, batch: List[str]) -> Embeddings:
+        try:
+            return self.embedding_model.get_text_embedding_batch(batch)
+        except Exception:
+            # A single bad input (or an OOM on a long batch) should not fail the whole ingestion
+            logger.exception("Batched embedding failed for %d texts, retrying one at a time", len(batch))
+            return self.embed_one_by_one(batch)
 
+    def embed_one_by_one(self, input_texts: List[str]) -> Embeddings:
+        return [self.embedding_model.get_text_embedding(text) for text in input_texts]
 
 class FlowerShopVectorStore:
-    def __init__(self):
-        db = PersistentClient(path=DB_PATH)
-
-        custom_embedding_function = CustomEmbeddingClass(MODEL_NAME)
-
-        self.faq_collection = db.get_or_create_collection(name='FAQ', embedding_function=custom_embedding_function)
-        self.inventory_collection = db.get_or_create_collection(name='Inventory', embedding_function=custom_embedding_function)
-
-        if self.faq_collection.count() == 0:
-            try :
-                self._load_faq_collection(FAQ_FILE_PATH)
-            except Exception as e:
-                raise ValueError(e)
-                
-
-        if self.inventory_collection.count() == 0:
-            self._load_inventory_collection(INVENTORY_FILE_PATH)
+    def __init__(self, embedding_function: CustomEmbeddingClass = None, backend: str = VECTOR_STORE_BACKEND,
+                 storage_dtype: str = VECTOR_STORAGE_DTYPE, db_path: str = None):
+        if backend == 'chroma':
+            self.db_path = db_path or DB_PATH
+            db = PersistentClient(path=self.db_path)
+        elif backend == 'numpy':
+            self.db_path = db_path or NUMPY_INDEX_PATH
+            db = NumpyVectorClient(path=self.db_path, storage_dtype=storage_dtype)
+        else:
+            raise ValueError(f"Unknown vector store backend: {backend}")
+        self.backend = backend
+
+        # Prefer the shared instance from store_registry; building one here loads the model again
+        custom_embedding_function = embedding_function or CustomEmbeddingClass(MODEL_NAME)
+
+        suffix = self._collection_suffix(custom_embedding_function)
+        self.faq_collection = db.get_or_create_collection(name='FAQ' + suffix, embedding_function=custom_embedding_function)
+        self.inventory_collection = db.get_or_create_collection(name='Inventory' + suffix, embedding_function=custom_embedding_function)
+
+        self.ingestion_summary = {
+            'FAQ': self._load_faq_collection(FAQ_FILE_PATH),
+            'Inventory': self._load_inventory_collection(INVENTORY_FILE_PATH),
+        }
+
+    @staticmethod
+    def _collection_suffix(embedding_function) -> str:
+        # Vectors from another model or of another length cannot share a collection, so they get their own
+        suffix = ''
+        if embedding_function.model_name != MODEL_NAME:
+            suffix += '_' + re.sub(r'[^A-Za-z0-9.-]+', '-', embedding_function.model_name)
+        if embedding_function.dimensions:
+            suffix += f"_{embedding_function.dimensions}d"
+        return suffix
 
     def _load_faq_collection(self, faq_file_path: str):
         try:
-            
-            with open(faq_file_path, 'r') as f:
-                faqs = json.load(f)
-                
-            # Create an instance of FAQCollection
-            obj_faq_collection = FAQCollection()
-
-            obj_faq_collection.add(
-                documents=[faq['question'] for faq in faqs] + [faq['answer'] for faq in faqs],
-                ids=[str(i) for i in range(0, 2*len(faqs))],
-                metadatas = faqs + faqs
-            )
-            self.faq_collection = obj_faq_collection
+            ingestor = IncrementalIngestor(self.faq_collection, os.path.join(self.db_path, 'manifests', f'{self.faq_collection.name}.json'))
+            return ingestor.sync(faq_file_path, faq_records)
         except Exception as ex:
             raise ValueError(ex)
 
     def _load_inventory_collection(self, inventory_file_path: str):
-        with open(inventory_file_path, 'r') as f:
-            inventories = json.load(f)
-            
-        # Create an instance of InventoryCollection
-        obj_inventory_collection = InventoryCollection()
-
-        obj_inventory_collection.add(
-            documents=[inventory['description'] for inventory in inventories],
-            ids=[str(i) for i in range(0, len(inventories))],
-            metadatas = inventories
-        )
-        self.inventory_collection = obj_inventory_collection
+        ingestor = IncrementalIngestor(self.inventory_collection, os.path.join(self.db_path, 'manifests', f'{self.inventory_collection.name}.json'))
+        return ingestor.sync(inventory_file_path, inventory_records)
 
     def query_faqs(self, query: str): 
         return self.faq_collection.query(query_texts=[query], n_results=5)
     
     def query_inventories(self, query: str):
-        return self.inventory_collection.query(query_texts=[query], n_results=5)
\ No newline at end of file
+        return self.inventory_collection.query(query_texts=[query], n_results=5)
+
+    def query_faqs_batch(self, queries: List[str], n_results: int = 5):
+        return self.faq_collection.query(query_texts=queries, n_results=n_results)
+
+    def query_inventories_batch(self, queries: List[str], n_results: int = 5):
+        return self.inventory_collection.query(query_texts=queries, n_results=n_results)
@@ -0,0 +1,63 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from src.langgraphagenticai.vectorstores.store_registry import vector_store_registry
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupManager:
+    """
+    Preloads heavy resources on a background thread when the app starts.
+
+    Each step goes through the same process-wide registry the tools use, so a request
+    that arrives mid warm-up blocks on the in-flight initialisation rather than
+    starting a second one. The thread is started at most once per process, however
+    many Streamlit reruns call start().
+    """
+    def __init__(self, steps: List[Tuple[str, Callable]]):
+        self.steps = steps
+        self._lock = threading.Lock()
+        self._thread = None
+        self.status: Dict[str, Dict] = {name: {'state': 'pending', 'seconds': None, 'error': None} for name, _ in steps}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='resource-warmup', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        for name, step in self.steps:
+            self.status[name]['state'] = 'loading'
+            started = time.perf_counter()
+            try:
+                step()
+                self.status[name]['state'] = 'ready'
+            except Exception as e:
+                # Leave the resource to be built (and the error surfaced) on first real use
+                logger.exception("Warm-up step %s failed", name)
+                self.status[name].update(state='failed', error=str(e))
+            self.status[name]['seconds'] = time.perf_counter() - started
+
+    def is_ready(self) -> bool:
+        return all(step['state'] == 'ready' for step in self.status.values())
+
+    def wait(self, timeout: float = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.is_ready()
+
+
+warmup_manager = WarmupManager([
+    ("Embedding model", vector_store_registry.get_embedding_function),
+    ("Vector store", vector_store_registry.get_store),
+    ("FAQ retriever", vector_store_registry.get_faq_retriever),
+])
+
+
+def start_warmup() -> WarmupManager:
+    warmup_manager.start()
+    return warmup_manager